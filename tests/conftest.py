@@ -0,0 +1,39 @@
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Widgets are built without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    # Anything under /forbidden/ answers 403, like an expired signed URL
+    def send_head(self):
+        if self.path.startswith('/forbidden/'):
+            self.send_error(403)
+            return None
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def http_root(tmp_path):
+    # A local web server over a scratch directory; yields (directory, base URL)
+    root = tmp_path / "www"
+    root.mkdir()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(_QuietHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture(scope="session", autouse=True)
+def qapp():
+    # One QApplication for the whole run; code under test that creates its
+    # own QCoreApplication picks this one up instead
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
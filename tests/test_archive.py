@@ -0,0 +1,87 @@
+import hashlib
+
+from vipedown.core.archive import DownloadArchive
+
+def _file(path, content=b"\x03" * 1000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+def test_record_survives_a_reload(tmp_path):
+    video = _file(tmp_path / "v.mp4")
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.add("youtube abc")
+    archive.record("youtube abc", str(video))
+
+    entry = DownloadArchive(tmp_path / "archive.jsonl").get("youtube abc")
+    assert entry['path'] == str(video)
+    assert entry['size'] == 1000
+    assert entry['sha256'] == hashlib.sha256(video.read_bytes()).hexdigest()
+
+def test_deleted_files_no_longer_count_as_downloaded(tmp_path):
+    video = _file(tmp_path / "v.mp4")
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.record("youtube abc", str(video))
+    assert "youtube abc" in archive
+
+    video.unlink()
+    assert "youtube abc" not in archive
+    assert "youtube other" not in archive
+
+def test_forget_is_persisted(tmp_path):
+    video = _file(tmp_path / "v.mp4")
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.record("youtube abc", str(video))
+    archive.forget("youtube abc")
+
+    reloaded = DownloadArchive(tmp_path / "archive.jsonl")
+    assert reloaded.get("youtube abc") is None
+    assert reloaded.find_by_checksum(hashlib.sha256(video.read_bytes()).hexdigest(), 1000) == []
+
+def test_torn_tail_is_dropped_and_cut_off(tmp_path):
+    video = _file(tmp_path / "v.mp4")
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.record("youtube abc", str(video))
+    intact = (tmp_path / "archive.jsonl").stat().st_size
+    with open(tmp_path / "archive.jsonl", 'a', encoding='utf-8') as f:
+        f.write('{"id": "youtube def", "pa')
+
+    reloaded = DownloadArchive(tmp_path / "archive.jsonl")
+    assert len(reloaded) == 1
+    assert (tmp_path / "archive.jsonl").stat().st_size == intact
+
+def test_missing_or_unreadable_files_are_not_recorded(tmp_path):
+    archive = DownloadArchive(tmp_path / "missing" / "archive.jsonl")
+    assert len(archive) == 0
+
+    archive.record("youtube abc", str(tmp_path / "gone.mp4"))
+    assert archive.get("youtube abc") is None
+
+def test_identical_files_are_found_by_checksum_and_size(tmp_path):
+    video = _file(tmp_path / "v.mp4")
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.record("youtube abc", str(video))
+    checksum = archive.get("youtube abc")['sha256']
+
+    assert [entry['id'] for entry in archive.find_by_checksum(checksum, 1000)] == ["youtube abc"]
+    assert archive.find_by_checksum(checksum, 999) == []
+
+def test_space_saved_counts_duplicates_and_copies(tmp_path):
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.record("youtube abc", str(_file(tmp_path / "a.mp4")))
+    archive.record("vimeo 1", str(_file(tmp_path / "b.mp4")))
+    archive.mark_duplicate("vimeo 1", "youtube abc")
+    archive.add_copy("youtube abc", str(tmp_path / "copy" / "a.mp4"))
+    archive.add_copy("youtube abc", str(tmp_path / "copy" / "a.mp4"))
+
+    assert archive.space_saved() == 2000
+    assert DownloadArchive(tmp_path / "archive.jsonl").space_saved() == 2000
+
+def test_entries_without_a_recorded_path_do_not_count_as_downloaded(tmp_path):
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    # yt-dlp's own bookkeeping, with no path following it
+    archive.add("youtube abc")
+    assert "youtube abc" not in archive
+
+    archive.record("youtube abc", str(_file(tmp_path / "v.mp4")))
+    assert "youtube abc" in archive
@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pytest
+
+from vipedown.core.bandwidth import BandwidthGovernor, TokenBucket, parse_rate, schedule_limit
+
+@pytest.mark.parametrize("value, expected", [
+    ("", 0),
+    ("0", 0),
+    ("500K", 500 * 1024),
+    ("2M", 2 * 1024 * 1024),
+    ("1.5MiB", int(1.5 * 1024 * 1024)),
+    ("2mb/s", 2 * 1024 * 1024),
+    ("fast", None),
+])
+def test_parse_rate(value, expected):
+    assert parse_rate(value) == expected
+
+SCHEDULE = [
+    {"start": "09:00", "end": "18:00", "limit": 1000},
+    {"start": "22:00", "end": "06:00", "limit": 5000},
+]
+
+@pytest.mark.parametrize("hour, expected", [(9, 1000), (17, 1000), (18, None), (23, 5000), (3, 5000), (6, None)])
+def test_schedule_limit_windows_wrap_past_midnight(hour, expected):
+    assert schedule_limit(SCHEDULE, datetime(2024, 1, 1, hour, 0)) == expected
+
+def test_schedule_limit_skips_invalid_entries():
+    schedule = [{"start": "nine", "end": "18:00", "limit": 1}, {"start": "00:00", "end": "23:59", "limit": 7}]
+    assert schedule_limit(schedule, datetime(2024, 1, 1, 12, 0)) == 7
+
+def test_token_bucket_charges_debt_beyond_the_burst():
+    bucket = TokenBucket(1000)
+    assert bucket.reserve(100) == pytest.approx(0.1, abs=0.01)
+    assert TokenBucket(0).reserve(10 ** 9) == 0
+
+def test_global_budget_is_split_evenly():
+    governor = BandwidthGovernor(global_limit=900)
+    for key in "abc":
+        governor.register(key)
+    assert [governor.rate_of(key) for key in "abc"] == [300, 300, 300]
+
+    governor.unregister("c")
+    assert governor.rate_of("a") == 450
+
+def test_capped_downloads_leave_their_share_to_the_others():
+    governor = BandwidthGovernor(global_limit=900)
+    governor.register("a", limit=100)
+    governor.register("b")
+    governor.register("c")
+    assert (governor.rate_of("a"), governor.rate_of("b"), governor.rate_of("c")) == (100, 400, 400)
+
+    governor.set_item_limit("a", 0)
+    assert governor.rate_of("b") == 300
+
+def test_without_a_global_limit_only_item_caps_apply():
+    governor = BandwidthGovernor()
+    governor.register("a", limit=100)
+    governor.register("b")
+    assert (governor.rate_of("a"), governor.rate_of("b")) == (100, 0)
+
+    governor.set_global_limit(1000)
+    assert governor.rate_of("b") == 900
+
+def test_schedule_overrides_the_global_limit():
+    all_day = [{"start": "00:00", "end": "12:00", "limit": 200}, {"start": "12:00", "end": "00:00", "limit": 200}]
+    governor = BandwidthGovernor(global_limit=1000, schedule=all_day)
+    governor.register("a")
+    assert governor.rate_of("a") == 200
+
+    governor.set_schedule([])
+    assert governor.rate_of("a") == 1000
+
+def test_throttle_stops_waiting_when_cancelled():
+    governor = BandwidthGovernor(global_limit=10)
+    governor.register("a")
+    governor.throttle("a", 10 ** 6, keep_waiting=lambda: False)
+    assert governor.rate_of("a") == 10
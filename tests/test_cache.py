@@ -0,0 +1,71 @@
+from vipedown.core.cache import MetadataCache
+
+def _writes(monkeypatch):
+    from vipedown.core import cache
+    writes = []
+    original = cache.atomic_write_text
+    monkeypatch.setattr(cache, 'atomic_write_text',
+                        lambda path, text: (writes.append(path.name), original(path, text)))
+    return writes
+
+def test_get_and_put_round_trip(tmp_path):
+    cache = MetadataCache(tmp_path)
+    cache.put("https://EXAMPLE.com/v?id=1", "best", {'title': 'Video', 'id': '1'})
+
+    assert cache.get("https://example.com/v?id=1", "best") == {'title': 'Video', 'id': '1'}
+    assert cache.get("https://example.com/v?id=1", "worst") is None
+    assert cache.get_title("https://example.com/v?id=1") == 'Video'
+
+def test_hits_do_not_rewrite_the_index(tmp_path, monkeypatch):
+    cache = MetadataCache(tmp_path)
+    cache.put("https://example.com/1", "", {'title': 'One'})
+    writes = _writes(monkeypatch)
+
+    for _ in range(10):
+        assert cache.get("https://example.com/1")
+    assert "index.json" not in writes
+
+    cache.flush()
+    assert writes.count("index.json") == 1
+
+def test_index_writes_are_batched(tmp_path, monkeypatch):
+    cache = MetadataCache(tmp_path)
+    cache.put("https://example.com/0", "", {'title': 'Zero'})
+    writes = _writes(monkeypatch)
+
+    for number in range(1, 50):
+        cache.put(f"https://example.com/{number}", "", {'title': str(number)})
+    cache.flush()
+
+    assert writes.count("index.json") == 1
+    # Nothing was lost by batching
+    assert MetadataCache(tmp_path).get_title("https://example.com/49") == '49'
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = MetadataCache(tmp_path, ttl=-1)
+    cache.put("https://example.com/1", "", {'title': 'One'})
+    assert cache.get("https://example.com/1") is None
+
+def test_claim_waits_for_an_extraction_in_progress(tmp_path):
+    import threading
+
+    cache = MetadataCache(tmp_path)
+    assert cache.claim("https://example.com/v", "best") is None
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(cache.claim("https://example.com/v", "best")))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    cache.put("https://example.com/v", "best", {'title': 'Video'})
+    cache.release("https://example.com/v", "best")
+    waiter.join(5)
+
+    assert results == [{'title': 'Video'}]
+    # A hit leaves nothing claimed behind
+    assert cache.claim("https://example.com/v", "best", wait=0) == {'title': 'Video'}
+
+def test_claim_gives_up_waiting_after_the_timeout(tmp_path):
+    cache = MetadataCache(tmp_path)
+    assert cache.claim("https://example.com/v") is None
+    assert cache.claim("https://example.com/v", wait=0.05) is None
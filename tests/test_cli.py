@@ -0,0 +1,19 @@
+import json
+
+from vipedown import cli
+
+def _events(output):
+    return [json.loads(line) for line in output.splitlines() if line.startswith('{')]
+
+def test_first_run_deduplicates_identical_downloads(http_root, tmp_path, monkeypatch, capsys):
+    root, base = http_root
+    (root / "a.mp4").write_bytes(b"\x01" * 100000)
+    (root / "b.mp4").write_bytes(b"\x01" * 100000)
+    # A fresh home: empty configuration and download archive
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+    status = cli.main([f"{base}/a.mp4", f"{base}/b.mp4", "-o", str(tmp_path / "out"), "-j", "1"])
+
+    finished = [event for event in _events(capsys.readouterr().out) if event['event'] == 'queue_finished']
+    assert status == 0
+    assert finished[-1]['space_saved'] == 100000
@@ -0,0 +1,69 @@
+from PyQt6.QtCore import Qt
+
+from vipedown.core.archive import DownloadArchive
+from vipedown.core.dedup import Deduplicator
+from vipedown.core.downloader import VipeDownloader, DownloadConfig
+
+from .helpers import write_playlist
+
+def _download(downloader, config):
+    outcome = []
+    downloader.completed.connect(lambda success, message: outcome.append((success, message)))
+    downloader.download(config)
+    downloader.completed.disconnect()
+    return outcome[-1]
+
+def test_identical_downloads_are_linked_with_an_empty_archive(http_root, tmp_path):
+    root, base = http_root
+    (root / "a.mp4").write_bytes(b"\x01" * 100000)
+    (root / "b.mp4").write_bytes(b"\x01" * 100000)
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    assert len(archive) == 0
+    downloader = VipeDownloader(archive=archive, dedup=Deduplicator(archive))
+    out = tmp_path / "out"
+
+    assert _download(downloader, DownloadConfig(f"{base}/a.mp4", out))[0]
+    # Recorded with its path even though the archive started out empty
+    assert archive.get("generic a")['path'] == str(out / "a.mp4")
+    success, message = _download(downloader, DownloadConfig(f"{base}/b.mp4", out))
+
+    assert success
+    assert "saved" in message
+    assert archive.space_saved() == 100000
+    assert (out / "b.mp4").read_bytes() == (root / "b.mp4").read_bytes()
+
+def test_archived_url_is_linked_into_a_new_folder_without_extraction(tmp_path):
+    original = tmp_path / "first" / "Never Gonna Give You Up.mp4"
+    original.parent.mkdir()
+    original.write_bytes(b"\x02" * 50000)
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    archive.record("youtube dQw4w9WgXcQ", str(original))
+    downloader = VipeDownloader(archive=archive, dedup=Deduplicator(archive))
+
+    # Recognised from the URL alone, so nothing is fetched
+    success, message = _download(
+        downloader, DownloadConfig("https://www.youtube.com/watch?v=dQw4w9WgXcQ", tmp_path / "second")
+    )
+
+    assert success
+    assert "linked" in message
+    assert (tmp_path / "second" / original.name).read_bytes() == original.read_bytes()
+    assert archive.space_saved() == 50000
+
+def test_archived_playlist_entries_are_linked_into_the_playlist_folder(http_root, tmp_path):
+    root, base = http_root
+    write_playlist(root, ["a.mp4", "b.mp4"])
+    archive = DownloadArchive(tmp_path / "archive.jsonl")
+    downloader = VipeDownloader(archive=archive, dedup=Deduplicator(archive))
+    assert _download(downloader, DownloadConfig(f"{base}/list.html", tmp_path / "first", playlist=True))[0]
+    downloaded = sorted(path.name for path in (tmp_path / "first" / "List").iterdir())
+
+    progress = []
+    # Entries report from their own threads and no event loop runs here
+    downloader.playlist_progress.connect(progress.append, Qt.ConnectionType.DirectConnection)
+    success, message = _download(downloader, DownloadConfig(f"{base}/list.html", tmp_path / "second", playlist=True))
+
+    assert success
+    assert progress[-1]['skipped'] == 2
+    assert sorted(path.name for path in (tmp_path / "second" / "List").iterdir()) == downloaded
+    assert archive.space_saved() == 2 * 200000
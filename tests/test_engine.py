@@ -0,0 +1,61 @@
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+def _start_job_in_daemon(results):
+    from PyQt6.QtCore import QCoreApplication, QTimer
+    from vipedown.core.engine import create_engine
+    from vipedown.core.downloader import DownloadConfig
+
+    app = QCoreApplication([])
+    engine = create_engine("processes")
+    outcome = {}
+
+    def on_completed(job_id, success, message):
+        outcome['message'] = message
+        app.quit()
+
+    engine.completed.connect(on_completed)
+    # Nothing listens on the discard port, so the job fails fast on its own
+    engine.start("job", DownloadConfig("http://127.0.0.1:9/video.mp4", Path(tempfile.mkdtemp())))
+    QTimer.singleShot(30000, app.quit)
+    app.exec()
+    engine.shutdown()
+    results.put((type(engine).__name__, outcome.get('message', '')))
+
+def test_processes_backend_falls_back_to_threads_in_daemon_process():
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    process = context.Process(target=_start_job_in_daemon, args=(results,), daemon=True)
+    process.start()
+    engine, message = results.get(timeout=60)
+    process.join(10)
+
+    assert engine == "DownloadEngine"
+    assert message
+    assert "daemonic" not in message
+
+def _create_engine_in_app_process(results):
+    from PyQt6.QtCore import QCoreApplication
+    from vipedown.core.engine import create_engine
+
+    app = QCoreApplication([])
+    engine = create_engine("processes")
+    results.put(type(engine).__name__)
+    engine.shutdown()
+
+def test_gui_process_gets_worker_processes():
+    from vipedown.main import start_app_process
+
+    # As main() launches the GUI
+    previous = multiprocessing.get_start_method(allow_none=True)
+    multiprocessing.set_start_method('spawn', force=True)
+    try:
+        results = multiprocessing.Queue()
+        process = start_app_process(_create_engine_in_app_process, (results,))
+        engine = results.get(timeout=60)
+        process.join(10)
+    finally:
+        multiprocessing.set_start_method(previous, force=True)
+
+    assert engine == "ProcessDownloadEngine"
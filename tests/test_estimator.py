@@ -0,0 +1,62 @@
+from vipedown.core.estimator import QueueEstimator
+from vipedown.core.persistence import QueueStore
+from vipedown.core.queue_manager import QueueManager, QueueItem, DownloadStatus
+
+def _item(url, playlist=False):
+    return QueueItem(url, 'video', 'best', playlist, '', False)
+
+def _setup(tmp_path, count=1, playlist=False):
+    manager = QueueManager(max_concurrent=3, store=QueueStore(tmp_path / "queue"))
+    items = manager.add_items([_item(f"https://example.com/v/{n}", playlist) for n in range(count)])
+    return manager, QueueEstimator(manager), items
+
+def _progress(filename, downloaded, total):
+    return {'status': 'downloading', 'filename': filename, 'downloaded_bytes': downloaded, 'total_bytes': total}
+
+def test_resolved_sizes_count_what_is_left(qapp, tmp_path):
+    manager, estimator, (first, second) = _setup(tmp_path, 2)
+    manager.set_metadata(first.id, {'filesize': 1000})
+    first.progress = 40
+
+    assert estimator.bytes_remaining() == (600, 1)
+
+    manager.set_metadata(second.id, {'filesize': 500})
+    assert estimator.bytes_remaining() == (1100, 0)
+
+def test_finished_items_and_playlists(qapp, tmp_path):
+    manager, estimator, (item,) = _setup(tmp_path)
+    manager.set_metadata(item.id, {'filesize': 1000})
+    manager.update_status(item.id, DownloadStatus.COMPLETED)
+    assert estimator.bytes_remaining() == (0, 0)
+
+    _, estimator, _ = _setup(tmp_path / "other", playlist=True)
+    assert estimator.bytes_remaining() == (0, 1)
+
+def test_merged_formats_use_the_larger_of_resolved_and_reported(qapp, tmp_path):
+    manager, estimator, (item,) = _setup(tmp_path)
+    manager.set_metadata(item.id, {'filesize': 1000})
+    estimator.record_progress(item.id, _progress("v.f137.mp4", 300, 800))
+    assert estimator.bytes_remaining() == (700, 0)
+
+    # The video is done and the audio starts; reported totals now exceed the estimate
+    estimator.record_progress(item.id, _progress("v.f137.mp4", 800, 800))
+    estimator.record_progress(item.id, _progress("v.f140.m4a", 100, 400))
+    assert estimator.bytes_remaining() == (300, 0)
+
+def test_reported_sizes_cover_unresolved_items(qapp, tmp_path):
+    _, estimator, (item,) = _setup(tmp_path)
+    estimator.record_progress(item.id, _progress("v.mp4", 250, 1000))
+    assert estimator.bytes_remaining() == (750, 0)
+
+    estimator.forget(item.id)
+    assert estimator.bytes_remaining() == (0, 1)
+
+def test_resumed_and_restarted_files_only_count_new_bytes(qapp, tmp_path):
+    _, estimator, (item,) = _setup(tmp_path)
+    # The first report is a resumed partial file and is not new traffic
+    estimator.record_progress(item.id, _progress("v.mp4", 5000, 10000))
+    estimator.record_progress(item.id, _progress("v.mp4", 6000, 10000))
+    assert estimator._bytes == 1000
+
+    estimator.record_progress(item.id, _progress("v.mp4", 200, 10000))
+    assert estimator._bytes == 1200
@@ -0,0 +1,31 @@
+import pytest
+
+from vipedown.core.queue_manager import QueueItem
+
+def _progress(percent):
+    return {'status': 'downloading', 'percent': percent, 'total_bytes': 100, 'downloaded_bytes': percent,
+            'speed': 0, 'eta': 0, 'filename': f"/tmp/{percent}.mp4"}
+
+def test_progress_panel_follows_one_download(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    from vipedown.ui.main_window import MainWindow
+    window = MainWindow()
+    # The example URLs don't resolve; keep the background resolver off them
+    monkeypatch.setattr(window.runner.prefetcher, 'request', lambda *args, **kwargs: False)
+    manager = window.queue_manager
+    manager.set_max_concurrent(2)
+    manager.add_items([QueueItem(f"https://example.com/{n}", 'video', 'best', False, '', False) for n in (1, 2)])
+    first, second = manager.get_next_item(), manager.get_next_item()
+
+    window._update_progress(first.id, _progress(10))
+    window._update_progress(second.id, _progress(90))
+    assert window.progress_bar.value() == 10
+    assert "2 downloads running" in window.phase_label.text()
+
+    # Selecting a running item in the queue moves the panel over to it
+    window.queue_widget.queue_list.setCurrentIndex(window.queue_widget.queue_model.index(1))
+    window._update_progress(second.id, _progress(90))
+    window._update_progress(first.id, _progress(20))
+    assert window.progress_bar.value() == 90
+    with pytest.raises(SystemExit):
+        window.safe_quit()
@@ -0,0 +1,62 @@
+import threading
+
+from PyQt6.QtCore import Qt
+
+from vipedown.core.downloader import DownloadConfig
+from vipedown.core.orchestrator import DownloadOrchestrator
+
+class _StuckDownloader:
+    # Ignores cancel() until the test lets it go, like yt-dlp between hooks
+    def __init__(self, started, release):
+        self.started = started
+        self.release = release
+
+    def download(self, config):
+        self.started.set()
+        self.release.wait(10)
+
+    def cancel(self):
+        pass
+
+class _Orchestrator(DownloadOrchestrator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started = {}
+        self.release = threading.Event()
+
+    def _create_downloader(self, job):
+        self.started[job.job_id] = threading.Event()
+        return _StuckDownloader(self.started[job.job_id], self.release)
+
+def _wait_until(condition, timeout=5.0):
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        event.wait(0.01)
+    return condition()
+
+def _wait_for(orchestrator, job_id, timeout=5.0):
+    return _wait_until(lambda: job_id in orchestrator.started, timeout)
+
+def test_cancelled_job_keeps_its_slot_until_its_thread_exits(tmp_path):
+    orchestrator = _Orchestrator(max_in_flight=1)
+    completed = []
+    orchestrator.completed.connect(
+        lambda job_id, success, message: completed.append((job_id, message)), Qt.ConnectionType.DirectConnection
+    )
+    config = DownloadConfig("https://example.com/v", tmp_path)
+    orchestrator.start("stuck", config)
+    assert _wait_for(orchestrator, "stuck")
+    assert orchestrator.started["stuck"].wait(5)
+
+    orchestrator.cancel("stuck")
+    orchestrator.start("next", config)
+    # Reported straight away, but the next job waits for the thread
+    assert _wait_until(lambda: completed == [("stuck", "Download cancelled")])
+    assert not _wait_for(orchestrator, "next", timeout=0.3)
+
+    orchestrator.release.set()
+    assert _wait_for(orchestrator, "next")
+    assert orchestrator.started["next"].wait(5)
+    orchestrator.shutdown()
@@ -0,0 +1,66 @@
+import json
+
+from vipedown.core.persistence import QueueStore
+
+def _store(tmp_path, **kwargs):
+    return QueueStore(tmp_path / "queue", **kwargs)
+
+def test_journal_replays_puts_removes_and_order(tmp_path):
+    store = _store(tmp_path)
+    for item_id in "abc":
+        store.record_put({'id': item_id, 'url': item_id})
+    store.flush()
+    store.record_remove("b")
+    store.record_order(["c", "a"])
+    store.flush()
+
+    assert [item['id'] for item in _store(tmp_path).load()] == ["c", "a"]
+
+def test_only_the_latest_change_per_item_is_written(tmp_path):
+    store = _store(tmp_path)
+    store.record_put({'id': "a", 'progress': 10})
+    store.record_put({'id': "a", 'progress': 20})
+    assert store.pending_count() == 1
+    store.flush()
+
+    assert _store(tmp_path).load() == [{'id': "a", 'progress': 20}]
+
+def test_truncated_last_journal_line_is_dropped_and_cut_off(tmp_path):
+    store = _store(tmp_path)
+    store.record_put({'id': "a"})
+    store.flush()
+    journal = tmp_path / "queue" / "queue.journal"
+    intact = journal.stat().st_size
+    with open(journal, 'a', encoding='utf-8') as f:
+        f.write('{"op": "put", "item": {"id": "b"')
+
+    store = _store(tmp_path)
+    assert store.load() == [{'id': "a"}]
+    assert journal.stat().st_size == intact
+
+    # The next append starts on a clean line and is read back
+    store.record_put({'id': "c"})
+    store.flush()
+    assert [item['id'] for item in _store(tmp_path).load()] == ["a", "c"]
+
+def test_compaction_folds_the_journal_into_the_snapshot(tmp_path):
+    store = _store(tmp_path, compact_threshold=2)
+    store.record_put({'id': "a"})
+    store.record_put({'id': "b"})
+    store.flush()
+    assert store.needs_compaction()
+
+    store.compact([{'id': "a"}, {'id': "b"}])
+
+    assert not store.needs_compaction()
+    assert (tmp_path / "queue" / "queue.journal").read_text() == ""
+    assert json.loads((tmp_path / "queue" / "queue.json").read_text()) == [{'id': "a"}, {'id': "b"}]
+
+def test_clear_drops_everything_before_it(tmp_path):
+    store = _store(tmp_path)
+    store.compact([{'id': "a"}])
+    store.record_clear()
+    store.record_put({'id': "b"})
+    store.flush()
+
+    assert _store(tmp_path).load() == [{'id': "b"}]
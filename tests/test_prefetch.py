@@ -0,0 +1,91 @@
+import threading
+from pathlib import Path
+
+from vipedown.core.downloader import DownloadConfig
+from vipedown.core.engine import DownloadEngine
+from vipedown.core.persistence import QueueStore
+from vipedown.core.prefetch import MetadataPrefetcher, URGENT, BACKGROUND, summarize
+from vipedown.core.queue_manager import QueueManager, QueueItem
+from vipedown.core.runner import QueueRunner
+
+class _Engine:
+    def __init__(self):
+        self.calls = []
+        self.done = threading.Semaphore(0)
+
+    def prefetch(self, config, summary=False):
+        self.calls.append((config.url, summary))
+        self.done.release()
+        return {'title': config.url, 'duration': 10}
+
+def _config(url):
+    return DownloadConfig(url, Path("/tmp"))
+
+def test_summarize_sums_merged_formats():
+    info = {'title': 't', 'duration': 5, 'thumbnail': 'x',
+            'requested_formats': [{'filesize': 100}, {'filesize_approx': 20}]}
+    assert summarize(info) == {'title': 't', 'duration': 5, 'filesize': 120, 'thumbnail': 'x'}
+    assert summarize({'requested_formats': [{'filesize': 100}, {}]})['filesize'] == 0
+
+def test_background_requests_can_be_promoted():
+    engine = _Engine()
+    prefetcher = MetadataPrefetcher(engine, workers=1)
+    assert prefetcher.request("a", _config("a"), BACKGROUND)
+    assert engine.done.acquire(timeout=5)
+    assert not prefetcher.request("a", _config("a"), BACKGROUND)
+
+    # Its turn comes up: requested again, which the cache then answers
+    assert prefetcher.request("a", _config("a"), URGENT)
+    assert engine.done.acquire(timeout=5)
+    assert not prefetcher.request("a", _config("a"), URGENT)
+    prefetcher.shutdown()
+
+    assert engine.calls == [("a", True), ("a", False)]
+
+def test_runner_resolves_only_newly_added_items(qapp, tmp_path, monkeypatch):
+    manager = QueueManager(max_concurrent=1, store=QueueStore(tmp_path / "queue"))
+    runner = QueueRunner(manager, DownloadEngine(), tmp_path / "out", prefetch_depth=0)
+    requested = []
+    monkeypatch.setattr(runner.prefetcher, 'request',
+                        lambda item_id, config, priority=URGENT: requested.append((config.url, priority)))
+
+    manager.add_item(QueueItem("https://example.com/1", 'video', 'best', False, '', False))
+    manager.add_items([QueueItem("https://example.com/2", 'video', 'best', False, '', False),
+                       QueueItem("https://example.com/list", 'video', 'best', True, '', False)])
+    manager.pause_queue()
+    manager.resume_queue()
+
+    assert requested == [("https://example.com/1", BACKGROUND), ("https://example.com/2", BACKGROUND)]
+    runner.shutdown()
+
+def test_background_resolve_is_reused_by_the_download(http_root, tmp_path, monkeypatch):
+    import yt_dlp
+    from PyQt6.QtCore import Qt
+    from vipedown.core.cache import MetadataCache
+    from vipedown.core.downloader import VipeDownloader
+
+    root, base = http_root
+    (root / "a.mp4").write_bytes(b"\x01" * 100000)
+    extractions = []
+    original = yt_dlp.YoutubeDL.extract_info
+    monkeypatch.setattr(yt_dlp.YoutubeDL, 'extract_info',
+                        lambda self, url, *args, **kwargs: (extractions.append(url), original(self, url, *args, **kwargs))[1])
+    cache = MetadataCache(tmp_path / "cache")
+    engine = DownloadEngine(cache=cache)
+    prefetcher = MetadataPrefetcher(engine, workers=1)
+    resolved = threading.Event()
+    prefetcher.prefetched.connect(lambda item_id, summary: resolved.set(), Qt.ConnectionType.DirectConnection)
+    config = DownloadConfig(f"{base}/a.mp4", tmp_path / "out")
+
+    assert prefetcher.request("a", config, BACKGROUND)
+    assert resolved.wait(10)
+    assert prefetcher.request("a", config, URGENT)
+    outcome = []
+    downloader = VipeDownloader(cache)
+    downloader.completed.connect(lambda success, message: outcome.append(success))
+    downloader.download(config)
+    prefetcher.shutdown()
+    engine.shutdown()
+
+    assert outcome == [True]
+    assert extractions == [config.url]
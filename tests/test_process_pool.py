@@ -0,0 +1,73 @@
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QTimer
+
+from vipedown.core.downloader import DownloadConfig
+from vipedown.core.process_pool import ProcessDownloadEngine
+from vipedown.core.tuning import HostTuner
+
+from .helpers import write_playlist
+
+def test_playlist_events_from_entry_threads_reach_the_parent(http_root, tmp_path):
+    root, base = http_root
+    write_playlist(root, ["a.mp4", "b.mp4", "c.mp4"])
+    app = QCoreApplication.instance() or QCoreApplication([])
+    engine = ProcessDownloadEngine()
+    events = {'progress': 0, 'playlist_progress': 0}
+    outcome = {}
+
+    def on_completed(job_id, success, message):
+        outcome['success'] = success
+        app.quit()
+
+    engine.progress.connect(lambda job_id, progress: events.__setitem__('progress', events['progress'] + 1))
+    engine.playlist_progress.connect(
+        lambda job_id, progress: events.__setitem__('playlist_progress', events['playlist_progress'] + 1)
+    )
+    engine.completed.connect(on_completed)
+    engine.start("job", DownloadConfig(f"{base}/list.html", tmp_path / "out", playlist=True))
+    QTimer.singleShot(60000, app.quit)
+    app.exec()
+    engine.shutdown()
+
+    assert outcome.get('success')
+    assert events['progress'] > 0
+    assert events['playlist_progress'] >= 3
+
+class _SlowTuner(HostTuner):
+    # Holds the "slow" job's call until the other job has finished
+    def __init__(self, path):
+        super().__init__(path)
+        self.release = threading.Event()
+        self.held_until_released = None
+
+    def options_for(self, url):
+        if "slow" in url:
+            self.held_until_released = self.release.wait(20)
+        return super().options_for(url)
+
+def test_slow_remote_call_does_not_hold_up_other_jobs(http_root, tmp_path):
+    root, base = http_root
+    (root / "a.mp4").write_bytes(b"\x01" * 100000)
+    (root / "slow.mp4").write_bytes(b"\x02" * 100000)
+    app = QCoreApplication.instance() or QCoreApplication([])
+    tuner = _SlowTuner(tmp_path / "tuning.json")
+    engine = ProcessDownloadEngine(tuner=tuner)
+    finished = []
+
+    def on_completed(job_id, success, message):
+        finished.append((job_id, success))
+        if job_id == "fast":
+            tuner.release.set()
+        if len(finished) == 2:
+            app.quit()
+
+    engine.completed.connect(on_completed)
+    engine.start("slow", DownloadConfig(f"{base}/slow.mp4", tmp_path / "out"))
+    engine.start("fast", DownloadConfig(f"{base}/a.mp4", tmp_path / "out"))
+    QTimer.singleShot(60000, app.quit)
+    app.exec()
+    engine.shutdown()
+
+    assert finished == [("fast", True), ("slow", True)]
+    assert tuner.held_until_released
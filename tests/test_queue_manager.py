@@ -0,0 +1,73 @@
+from vipedown.core.persistence import QueueStore
+from vipedown.core.queue_manager import QueueManager, QueueItem, DownloadStatus
+
+def _item(url):
+    return QueueItem(url, 'video', 'best', False, '', False)
+
+def _manager(tmp_path):
+    return QueueManager(max_concurrent=1, store=QueueStore(tmp_path / "queue"))
+
+def test_add_items_skips_urls_already_waiting(qapp, tmp_path):
+    manager = _manager(tmp_path)
+    manager.add_items([_item("https://example.com/v/1")])
+
+    added = manager.add_items([_item("https://EXAMPLE.com/v/1"), _item("https://example.com/v/2")])
+
+    assert [item.url for item in added] == ["https://example.com/v/2"]
+
+def test_finished_and_failed_urls_can_be_queued_again(qapp, tmp_path):
+    manager = _manager(tmp_path)
+    done, failed = manager.add_items([_item("https://example.com/v/1"), _item("https://example.com/v/2")])
+    manager.update_status(done.id, DownloadStatus.COMPLETED)
+    manager.update_status(failed.id, DownloadStatus.FAILED, "boom")
+
+    added = manager.add_items([_item("https://example.com/v/1"), _item("https://example.com/v/2")])
+
+    assert len(added) == 2
+    assert len(manager.get_queue()) == 4
+
+def _positions(manager):
+    return [manager.get_position(item.id) for item in manager.get_queue()]
+
+def test_positions_follow_moves(qapp, tmp_path):
+    manager = _manager(tmp_path)
+    items = manager.add_items([_item(f"https://example.com/v/{n}") for n in range(5)])
+
+    manager.move_item(4, 1)
+    assert [item.id for item in manager.get_queue()] == [items[n].id for n in (0, 4, 1, 2, 3)]
+    assert _positions(manager) == list(range(5))
+
+    manager.move_item(1, 4)
+    assert manager.get_queue() == items
+    assert _positions(manager) == list(range(5))
+
+def test_positions_close_up_after_removal(qapp, tmp_path):
+    manager = _manager(tmp_path)
+    items = manager.add_items([_item(f"https://example.com/v/{n}") for n in range(4)])
+
+    manager.remove_item(1)
+
+    assert manager.get_position(items[1].id) == -1
+    assert manager.get_item(items[1].id) is None
+    assert [manager.get_position(item.id) for item in items[2:]] == [1, 2]
+
+def test_active_items_cannot_be_moved_or_removed(qapp, tmp_path):
+    manager = _manager(tmp_path)
+    items = manager.add_items([_item(f"https://example.com/v/{n}") for n in range(2)])
+    assert manager.get_next_item() is items[0]
+
+    manager.move_item(0, 1)
+    manager.remove_item(0)
+
+    assert manager.get_queue() == items
+
+def test_restored_queue_keeps_its_order(qapp, tmp_path):
+    manager = _manager(tmp_path)
+    items = manager.add_items([_item(f"https://example.com/v/{n}") for n in range(3)])
+    manager.move_item(2, 0)
+    manager.flush()
+
+    restored = _manager(tmp_path)
+    assert restored.restore_queue() == 3
+    assert [item.id for item in restored.get_queue()] == [items[n].id for n in (2, 0, 1)]
+    assert _positions(restored) == [0, 1, 2]
@@ -0,0 +1,88 @@
+from vipedown.core.engine import DownloadEngine
+from vipedown.core.persistence import QueueStore
+from vipedown.core.queue_manager import QueueManager, QueueItem, DownloadStatus
+from vipedown.core.runner import QueueRunner
+
+class _Engine(DownloadEngine):
+    # Records jobs instead of running them; the test finishes them by hand
+    def __init__(self):
+        super().__init__()
+        self.started = []
+        self.running = set()
+
+    def start(self, job_id, config):
+        self.started.append(job_id)
+        self.running.add(job_id)
+
+    def pause(self, job_id):
+        self.running.discard(job_id)
+        self.paused.emit(job_id)
+
+    def pause_all(self):
+        for job_id in list(self.running):
+            self.pause(job_id)
+
+    def finish(self, job_id):
+        self.running.discard(job_id)
+        self.completed.emit(job_id, True, "done")
+
+    def is_running(self, job_id):
+        return job_id in self.running
+
+def _runner(qapp, tmp_path, urls):
+    manager = QueueManager(max_concurrent=1, store=QueueStore(tmp_path / "queue"))
+    engine = _Engine()
+    runner = QueueRunner(manager, engine, tmp_path / "out", prefetch_depth=0, resolve_metadata=False)
+    items = manager.add_items([QueueItem(url, 'video', 'best', False, '', False) for url in urls])
+    finished = []
+    runner.queue_finished.connect(lambda: finished.append(True))
+    return manager, engine, runner, [item.id for item in items], finished
+
+def test_resuming_an_item_in_a_paused_queue_does_not_finish_it(qapp, tmp_path):
+    manager, engine, runner, (first, second), finished = _runner(
+        qapp, tmp_path, ["https://example.com/1", "https://example.com/2"]
+    )
+    runner.start()
+    runner.pause()
+    assert manager.get_item(first).status == DownloadStatus.PAUSED
+
+    runner.resume_item(first)
+
+    assert not finished
+    assert manager.is_active()
+    assert manager.get_item(first).status == DownloadStatus.PENDING
+
+    runner.resume()
+    assert engine.started == [first, first]
+
+def test_queue_finishes_around_a_paused_item(qapp, tmp_path):
+    manager, engine, runner, (first, second), finished = _runner(
+        qapp, tmp_path, ["https://example.com/1", "https://example.com/2"]
+    )
+    runner.start()
+    runner.pause_item(second)
+    engine.finish(first)
+    assert finished == [True]
+    assert not manager.is_active()
+    assert manager.get_item(second).status == DownloadStatus.PAUSED
+
+    # Left for later: resuming it starts a new run
+    runner.resume_item(second)
+    assert manager.is_active()
+    engine.finish(second)
+
+    assert engine.started == [first, second]
+    assert finished == [True, True]
+    assert not manager.is_active()
+
+def test_restored_paused_items_do_not_block_the_run(qapp, tmp_path):
+    manager, engine, runner, (first, second), finished = _runner(
+        qapp, tmp_path, ["https://example.com/1", "https://example.com/2"]
+    )
+    manager.pause_item(second)
+    runner.start()
+    engine.finish(first)
+
+    assert engine.started == [first]
+    assert finished == [True]
+    assert not manager.is_active()
@@ -0,0 +1,71 @@
+from vipedown.core.cache import MetadataCache
+from vipedown.core.downloader import VipeDownloader, DownloadConfig
+from vipedown.core.tuning import HostTuner, host_of, DEFAULT_FRAGMENTS, DEFAULT_CHUNK, MAX_FRAGMENTS
+
+MB = 1024 * 1024
+
+def _tuner(tmp_path, **kwargs):
+    return HostTuner(tmp_path / "tuning.json", **kwargs)
+
+def test_host_of_ignores_www_and_case():
+    assert host_of("https://WWW.Example.com/watch?v=1") == "example.com"
+
+def test_unknown_host_gets_defaults(tmp_path):
+    assert _tuner(tmp_path).options_for("https://example.com/v") == {
+        'concurrent_fragment_downloads': DEFAULT_FRAGMENTS, 'http_chunk_size': DEFAULT_CHUNK
+    }
+
+def test_faster_downloads_keep_climbing_and_a_slower_probe_steps_back(tmp_path):
+    tuner = _tuner(tmp_path)
+    url = "https://example.com/v"
+    tuner.record_sample(url, 10 * MB, 10, fragmented=True)
+    tuner.record_sample(url, 20 * MB, 10, fragmented=True)
+    assert tuner.options_for(url)['concurrent_fragment_downloads'] == DEFAULT_FRAGMENTS + 2
+
+    tuner.record_sample(url, 5 * MB, 10, fragmented=True)
+    assert tuner.options_for(url)['concurrent_fragment_downloads'] == DEFAULT_FRAGMENTS + 1
+
+def test_fragments_never_exceed_the_maximum(tmp_path):
+    tuner = _tuner(tmp_path)
+    for _ in range(MAX_FRAGMENTS * 2):
+        tuner.record_sample("https://example.com/v", 10 * MB, 10, fragmented=True)
+    assert tuner.options_for("https://example.com/v")['concurrent_fragment_downloads'] == MAX_FRAGMENTS
+
+def test_small_samples_are_ignored(tmp_path):
+    tuner = _tuner(tmp_path)
+    tuner.record_sample("https://example.com/v", 1024, 1, fragmented=True)
+    assert not (tmp_path / "tuning.json").exists()
+
+def test_throttling_halves_settings_once_per_burst(tmp_path):
+    tuner = _tuner(tmp_path)
+    tuner.record_throttled("https://example.com/v", 429)
+    tuner.record_throttled("https://example.com/v", 429)
+    assert tuner.options_for("https://example.com/v") == {
+        'concurrent_fragment_downloads': DEFAULT_FRAGMENTS // 2, 'http_chunk_size': DEFAULT_CHUNK // 2
+    }
+    # And the state survives a restart
+    assert _tuner(tmp_path).options_for("https://example.com/v")['concurrent_fragment_downloads'] == 2
+
+def test_expired_cached_url_is_not_counted_as_throttling(http_root, tmp_path):
+    root, base = http_root
+    (root / "a.mp4").write_bytes(b"\x01" * 100000)
+    url = f"{base}/a.mp4"
+    cache = MetadataCache(tmp_path / "cache")
+    tuner = _tuner(tmp_path)
+    downloader = VipeDownloader(cache, tuner=tuner)
+    config = DownloadConfig(url, tmp_path / "out")
+    outcome = []
+    downloader.completed.connect(lambda success, message: outcome.append(success))
+    downloader.download(config)
+
+    # The cached format URL has since expired
+    variant = downloader._cache_variant(config)
+    info = cache.get(url, variant)
+    for fmt in [info, *info.get('formats', [])]:
+        fmt['url'] = f"{base}/forbidden/a.mp4"
+    cache.put(url, variant, info)
+    (tmp_path / "out" / "a.mp4").unlink()
+    downloader.download(config)
+
+    assert outcome == [True, True]
+    assert tuner.options_for(url)['concurrent_fragment_downloads'] == DEFAULT_FRAGMENTS
@@ -0,0 +1,198 @@
+import sys
+import json
+import signal
+import argparse
+from pathlib import Path
+from typing import List, Optional
+from PyQt6.QtCore import QCoreApplication, QTimer
+from loguru import logger
+
+from .core.config import ConfigManager
+from .core.cache import MetadataCache
+from .core.bandwidth import BandwidthGovernor, parse_rate
+from .core.tuning import HostTuner
+from .core.archive import DownloadArchive
+from .core.dedup import Deduplicator
+from .core.engine import create_engine
+from .core.persistence import QueueStore
+from .core.queue_manager import QueueManager, QueueItem, DownloadStatus
+from .core.runner import QueueRunner
+from .utils.urls import parse_url_list
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="vipedown-cli",
+        description="Run the VipeDown download queue without a GUI. "
+                    "Progress is written to stdout as one JSON object per line."
+    )
+    parser.add_argument("urls", nargs="*", help="URLs to download")
+    parser.add_argument("-i", "--input", metavar="FILE",
+                        help="read URLs from FILE, one per line ('-' for stdin)")
+    parser.add_argument("-o", "--output", type=Path, help="download directory")
+    parser.add_argument("-f", "--format", choices=["video", "audio"], help="download format")
+    parser.add_argument("-q", "--quality", help="video quality (e.g. 1080p, best)")
+    parser.add_argument("-j", "--jobs", type=int, help="number of concurrent downloads")
+    parser.add_argument("--playlist", action="store_true", help="download URLs as playlists")
+    parser.add_argument("--playlist-items", default="", help="playlist items, e.g. 1,3-5,7")
+    parser.add_argument("--playlist-workers", type=int,
+                        help="number of playlist entries downloaded in parallel")
+    parser.add_argument("-r", "--limit-rate", metavar="RATE",
+                        help="total download speed cap shared by all downloads (e.g. 500K, 4M)")
+    parser.add_argument("--item-limit-rate", metavar="RATE",
+                        help="speed cap for each individual download")
+    parser.add_argument("--backend", choices=["threads", "asyncio", "processes"],
+                        help="how downloads are scheduled (default: from the saved configuration)")
+    parser.add_argument("--timeout", type=float,
+                        help="abandon a download after this many seconds")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="download even if a URL is already in the download archive")
+    parser.add_argument("--resume", action="store_true",
+                        help="also run unfinished items left over from a previous headless run")
+    return parser.parse_args(argv)
+
+def _read_urls(args: argparse.Namespace) -> List[str]:
+    lines = list(args.urls)
+    if args.input == "-" or (args.input is None and not args.urls and not sys.stdin.isatty()):
+        lines.extend(sys.stdin.read().splitlines())
+    elif args.input:
+        lines.extend(Path(args.input).read_text(encoding="utf-8").splitlines())
+    urls, rejected = parse_url_list(lines)
+    for url in rejected:
+        logger.warning(f"Skipping invalid URL: {url}")
+    return urls
+
+def _emit(event: str, **fields) -> None:
+    print(json.dumps({"event": event, **fields}), flush=True)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(sys.argv[1:] if argv is None else argv)
+    urls = _read_urls(args)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    app.setApplicationName("VipeDown")
+
+    config = ConfigManager()
+    logger.remove()
+    logger.add(
+        config.get_log_path() / "vipedown-cli.log",
+        rotation="10 MB",
+        retention="1 month",
+        compression="gz",
+        level="INFO"
+    )
+    logger.add(sys.stderr, level="WARNING")
+
+    app_config = config.config
+    global_limit, item_limit = app_config.bandwidth_limit, 0
+    for option, value in (("--limit-rate", args.limit_rate), ("--item-limit-rate", args.item_limit_rate)):
+        if value is not None and parse_rate(value) is None:
+            print(f"vipedown-cli: invalid {option} value: {value}", file=sys.stderr)
+            return 2
+    if args.limit_rate is not None:
+        global_limit = parse_rate(args.limit_rate)
+    if args.item_limit_rate is not None:
+        item_limit = parse_rate(args.item_limit_rate)
+    download_path = args.output or app_config.download_path
+    format_type = args.format or app_config.default_format
+    quality = args.quality or (app_config.default_quality if format_type == "video" else "best")
+
+    cache = MetadataCache(ttl=app_config.metadata_cache_ttl, max_size=app_config.metadata_cache_size)
+    # Keep headless state apart from the GUI's queue so both can run at once
+    store = QueueStore(Path.home() / ".config" / "vipedown" / "headless")
+    queue_manager = QueueManager(args.jobs or app_config.max_concurrent, cache=cache, store=store)
+    if args.resume:
+        queue_manager.restore_queue(download_path)
+    else:
+        queue_manager.clear_queue()
+
+    queue_manager.add_items([
+        QueueItem(
+            url=url,
+            format_type=format_type,
+            quality=quality,
+            playlist=args.playlist,
+            playlist_items=args.playlist_items,
+            audio_only=format_type == "audio",
+            rate_limit=item_limit
+        )
+        for url in urls
+    ])
+
+    if not queue_manager.get_queue():
+        _emit("queue_finished", completed=0, failed=0)
+        return 0
+
+    archive = DownloadArchive() if app_config.use_download_archive and not args.no_archive else None
+    engine = create_engine(
+        args.backend or app_config.engine_backend,
+        cache=cache,
+        progress_rate=app_config.progress_rate,
+        governor=BandwidthGovernor(global_limit, app_config.bandwidth_schedule),
+        tuner=HostTuner() if app_config.adaptive_tuning else None,
+        archive=archive,
+        dedup=Deduplicator(archive) if archive is not None and app_config.deduplicate else None
+    )
+    runner = QueueRunner(
+        queue_manager, engine, download_path,
+        playlist_workers=args.playlist_workers or app_config.playlist_workers,
+        job_timeout=args.timeout if args.timeout is not None else app_config.job_timeout,
+        prefetch_depth=app_config.prefetch_depth,
+        resolve_metadata=app_config.resolve_queue_metadata
+    )
+    failed = []
+
+    def url_of(item_id: str) -> str:
+        item = queue_manager.get_item(item_id)
+        return item.url if item else ""
+
+    def on_progress(item_id: str, progress: dict):
+        _emit("progress", id=item_id, url=url_of(item_id), **progress)
+
+    def on_finished(item_id: str, success: bool, message: str):
+        if not success:
+            failed.append(item_id)
+        _emit("finished", id=item_id, url=url_of(item_id), success=success, message=message)
+
+    def on_queue_finished():
+        runner.shutdown()
+        engine.shutdown()
+        cache.flush()
+        queue_manager.flush()
+        status = queue_manager.get_queue_status()
+        _emit(
+            "queue_finished", completed=status[DownloadStatus.COMPLETED], failed=status[DownloadStatus.FAILED],
+            space_saved=engine.dedup.space_saved() if engine.dedup else 0
+        )
+        app.exit(1 if failed else 0)
+
+    runner.item_started.connect(lambda item_id: _emit("started", id=item_id, url=url_of(item_id)))
+    runner.item_info.connect(lambda item_id, info: _emit("info", id=item_id, url=url_of(item_id), **info))
+    runner.playlist_progress.connect(
+        lambda item_id, progress: _emit("playlist_progress", id=item_id, url=url_of(item_id), **progress)
+    )
+    runner.item_error.connect(lambda item_id, error: _emit("error", id=item_id, url=url_of(item_id), message=error))
+    runner.item_progress.connect(on_progress)
+    runner.item_finished.connect(on_finished)
+    runner.queue_finished.connect(on_queue_finished)
+
+    def on_interrupt(signum, frame):
+        _emit("interrupted")
+        runner.cancel()
+        runner.shutdown()
+        engine.shutdown()
+        cache.flush()
+        queue_manager.flush()
+        app.exit(130)
+
+    signal.signal(signal.SIGINT, on_interrupt)
+    signal.signal(signal.SIGTERM, on_interrupt)
+    # Give the interpreter a chance to run signal handlers while Qt's loop spins
+    interrupt_timer = QTimer()
+    interrupt_timer.timeout.connect(lambda: None)
+    interrupt_timer.start(200)
+
+    QTimer.singleShot(0, runner.start)
+    return app.exec()
+
+if __name__ == '__main__':
+    sys.exit(main())
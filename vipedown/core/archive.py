@@ -0,0 +1,183 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+import hashlib
+import json
+import os
+import threading
+import time
+from loguru import logger
+
+from ..utils.files import atomic_write_text
+
+def file_sha256(path: Path, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+class DownloadArchive:
+    # Index of finished downloads keyed by yt-dlp's archive id
+    # ("<extractor> <video id>") -> path, size and checksum. Stored as an
+    # append-only JSON-lines file where the last record for an id wins.
+    #
+    # It also implements the set interface yt-dlp expects from the
+    # download_archive option (`in`, add() and truthiness), so yt-dlp skips
+    # archived videos itself, before extraction where the URL alone
+    # identifies the video. An entry counts as downloaded only while its
+    # file exists: not once the file is deleted, nor when yt-dlp added it
+    # but its path was never recorded.
+
+    def __init__(self, archive_file: Optional[Path] = None):
+        self._archive_file = archive_file or Path.home() / ".config" / "vipedown" / "archive.jsonl"
+        self._lock = threading.Lock()
+        self._records = 0
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        # sha256 -> archive ids, for finding identical files under other ids
+        self._checksums: Dict[str, Set[str]] = {}
+        for entry in self._entries.values():
+            self._index(entry)
+
+    def __contains__(self, archive_id: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(archive_id)
+        if entry is None:
+            return False
+        return bool(entry['path']) and os.path.exists(entry['path'])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"DownloadArchive({str(self._archive_file)!r})"
+
+    def add(self, archive_id: str) -> None:
+        # Called by yt-dlp once a video is done; the path follows via record()
+        with self._lock:
+            if archive_id in self._entries:
+                return
+            entry = {'id': archive_id, 'path': '', 'size': 0, 'sha256': '', 'time': time.time()}
+            self._entries[archive_id] = entry
+            self._append(entry)
+
+    def record(self, archive_id: str, path: str, checksum: Optional[str] = None) -> None:
+        try:
+            size = os.path.getsize(path)
+            checksum = checksum or file_sha256(Path(path))
+        except OSError as e:
+            logger.warning(f"Not archiving {archive_id}, file unreadable: {e}")
+            return
+        entry = {'id': archive_id, 'path': str(path), 'size': size, 'sha256': checksum, 'time': time.time()}
+        with self._lock:
+            self._unindex(archive_id)
+            self._entries[archive_id] = entry
+            self._index(entry)
+            self._append(entry)
+
+    def find_by_checksum(self, checksum: str, size: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = self._checksums.get(checksum, ())
+            return [
+                dict(self._entries[archive_id]) for archive_id in ids
+                if self._entries[archive_id]['size'] == size
+            ]
+
+    def mark_duplicate(self, archive_id: str, original_id: str) -> None:
+        with self._lock:
+            entry = self._entries.get(archive_id)
+            if entry is None:
+                return
+            entry['duplicate_of'] = original_id
+            self._append(entry)
+
+    def add_copy(self, archive_id: str, path: str) -> None:
+        with self._lock:
+            entry = self._entries.get(archive_id)
+            if entry is None or path in entry.setdefault('copies', []):
+                return
+            entry['copies'].append(path)
+            self._append(entry)
+
+    def space_saved(self) -> int:
+        # Bytes not stored twice thanks to deduplication
+        with self._lock:
+            return sum(
+                entry['size'] * (bool(entry.get('duplicate_of')) + len(entry.get('copies', ())))
+                for entry in self._entries.values()
+            )
+
+    def get(self, archive_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(archive_id)
+            return dict(entry) if entry else None
+
+    def forget(self, archive_id: str) -> None:
+        with self._lock:
+            self._unindex(archive_id)
+            if self._entries.pop(archive_id, None) is not None:
+                self._append({'id': archive_id, 'removed': True})
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        if entry.get('sha256'):
+            self._checksums.setdefault(entry['sha256'], set()).add(entry['id'])
+
+    def _unindex(self, archive_id: str) -> None:
+        entry = self._entries.get(archive_id)
+        if entry and entry.get('sha256'):
+            ids = self._checksums.get(entry['sha256'], set())
+            ids.discard(archive_id)
+            if not ids:
+                self._checksums.pop(entry['sha256'], None)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        try:
+            self._archive_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._archive_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Failed to write download archive: {e}")
+            return
+        self._records += 1
+        # Superseded records pile up as paths get filled in; rewrite now and then
+        if self._records > 2 * len(self._entries) + 100:
+            self._compact()
+
+    def _compact(self) -> None:
+        try:
+            atomic_write_text(
+                self._archive_file,
+                ''.join(json.dumps(entry) + '\n' for entry in self._entries.values())
+            )
+        except OSError as e:
+            logger.error(f"Failed to compact download archive: {e}")
+            return
+        self._records = len(self._entries)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            if not self._archive_file.exists():
+                return entries
+            valid_end = 0
+            with open(self._archive_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-append
+                        logger.warning("Discarding corrupt download archive tail")
+                        break
+                    self._records += 1
+                    valid_end += len(line)
+                    if record.get('removed'):
+                        entries.pop(record['id'], None)
+                    else:
+                        entries[record['id']] = record
+            # Cut the torn tail off so the next append starts on a clean line
+            if valid_end < self._archive_file.stat().st_size:
+                os.truncate(self._archive_file, valid_end)
+        except OSError as e:
+            logger.error(f"Failed to load download archive: {e}")
+        return entries
@@ -0,0 +1,196 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from datetime import datetime, time as dtime
+import threading
+import time
+from yt_dlp.utils import parse_bytes, format_bytes
+from loguru import logger
+
+def parse_rate(value: str) -> Optional[int]:
+    # "500K", "2M", "1.5MiB" (bytes per second, binary units); empty or "0"
+    # means unlimited
+    value = value.strip().upper().removesuffix('/S').removesuffix('B').removesuffix('I')
+    if value in ('', '0'):
+        return 0
+    rate = parse_bytes(value)
+    return int(rate) if rate is not None else None
+
+def format_rate(rate: int) -> str:
+    return f"{format_bytes(rate)}/s" if rate > 0 else "unlimited"
+
+class TokenBucket:
+    def __init__(self, rate: float = 0, burst_seconds: float = 1.0):
+        self._burst_seconds = burst_seconds
+        self._rate = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_rate(rate)
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def set_rate(self, rate: float) -> None:
+        self._refill()
+        self._rate = max(0.0, rate)
+        self._tokens = min(self._tokens, self._capacity())
+
+    def reserve(self, amount: int) -> float:
+        # Takes the tokens now (going into debt if need be) and returns how
+        # long the caller must wait before the debt is paid off
+        if self._rate <= 0:
+            return 0.0
+        self._refill()
+        self._tokens -= amount
+        return -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+    def _capacity(self) -> float:
+        return self._rate * self._burst_seconds
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self._rate > 0:
+            self._tokens = min(self._capacity(), self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+def _parse_time(value: str) -> dtime:
+    hours, minutes = value.split(':')
+    return dtime(int(hours), int(minutes))
+
+def schedule_limit(schedule: List[Dict[str, Any]], now: Optional[datetime] = None) -> Optional[int]:
+    # Entries look like {"start": "09:00", "end": "18:00", "limit": 2097152};
+    # a window may wrap past midnight. The first matching window wins.
+    current = (now or datetime.now()).time()
+    for window in schedule:
+        try:
+            start, end = _parse_time(window['start']), _parse_time(window['end'])
+            limit = int(window['limit'])
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring invalid bandwidth schedule entry {window}: {e}")
+            continue
+        inside = start <= current < end if start <= end else current >= start or current < end
+        if inside:
+            return limit
+    return None
+
+class BandwidthGovernor:
+    # One token bucket per active download. The global budget (from the
+    # schedule, else the fixed cap) is split across downloads and re-split
+    # whenever one starts, finishes or changes its own cap; budget that a
+    # capped download can't use goes to the others. A limit of 0 means
+    # unlimited.
+
+    def __init__(self, global_limit: int = 0, schedule: Optional[List[Dict[str, Any]]] = None,
+                 schedule_check_interval: float = 30.0):
+        self._global_limit = max(0, global_limit)
+        self._schedule = list(schedule or [])
+        self._check_interval = schedule_check_interval
+        self._next_check = 0.0
+        self._effective_limit = self._resolve_limit()
+        self._item_limits: Dict[Hashable, int] = {}
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def set_global_limit(self, limit: int) -> None:
+        with self._lock:
+            self._global_limit = max(0, limit)
+            self._effective_limit = self._resolve_limit()
+            self._rebalance()
+
+    def set_schedule(self, schedule: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._schedule = list(schedule)
+            self._effective_limit = self._resolve_limit()
+            self._rebalance()
+
+    def current_limit(self) -> int:
+        return self._effective_limit
+
+    def refresh(self) -> None:
+        # Picks up schedule changes when nothing is calling throttle()
+        with self._lock:
+            self._check_schedule()
+
+    def register(self, key: Hashable, limit: int = 0) -> None:
+        with self._lock:
+            self._item_limits[key] = max(0, limit)
+            self._buckets[key] = TokenBucket()
+            self._rebalance()
+
+    def unregister(self, key: Hashable) -> None:
+        with self._lock:
+            self._item_limits.pop(key, None)
+            self._buckets.pop(key, None)
+            self._rebalance()
+
+    def set_item_limit(self, key: Hashable, limit: int) -> None:
+        with self._lock:
+            if key in self._item_limits:
+                self._item_limits[key] = max(0, limit)
+                self._rebalance()
+
+    def rate_of(self, key: Hashable) -> float:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket.rate if bucket else 0.0
+
+    def throttle(self, key: Hashable, amount: int,
+                 keep_waiting: Callable[[], bool] = lambda: True) -> None:
+        # Called from yt-dlp's progress hook after each block it reads, so
+        # sleeping here paces the download itself
+        if amount <= 0:
+            return
+        with self._lock:
+            self._check_schedule()
+            bucket = self._buckets.get(key)
+            wait = bucket.reserve(amount) if bucket else 0.0
+
+        deadline = time.monotonic() + wait
+        while keep_waiting():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, 0.25))
+
+    def _check_schedule(self) -> None:
+        now = time.monotonic()
+        if not self._schedule or now < self._next_check:
+            return
+        self._next_check = now + self._check_interval
+        limit = self._resolve_limit()
+        if limit != self._effective_limit:
+            logger.info(f"Bandwidth limit changed by schedule: {limit or 'unlimited'} B/s")
+            self._effective_limit = limit
+            self._rebalance()
+
+    def _resolve_limit(self) -> int:
+        scheduled = schedule_limit(self._schedule) if self._schedule else None
+        return self._global_limit if scheduled is None else max(0, scheduled)
+
+    def _rebalance(self) -> None:
+        if not self._buckets:
+            return
+
+        budget = float(self._effective_limit)
+        if budget <= 0:
+            for key, bucket in self._buckets.items():
+                bucket.set_rate(self._item_limits[key])
+            return
+
+        # Water-filling: capped downloads below the fair share keep their cap,
+        # the rest split what is left evenly
+        rates: Dict[Hashable, float] = {}
+        remaining = dict(self._item_limits)
+        while remaining:
+            share = budget / len(remaining)
+            capped = {key: cap for key, cap in remaining.items() if 0 < cap <= share}
+            if not capped:
+                for key in remaining:
+                    rates[key] = share
+                break
+            for key, cap in capped.items():
+                rates[key] = cap
+                budget -= cap
+                del remaining[key]
+
+        for key, bucket in self._buckets.items():
+            bucket.set_rate(rates[key])
@@ -0,0 +1,191 @@
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Set
+import hashlib
+import json
+import threading
+import time
+from loguru import logger
+
+from ..utils.files import atomic_write_text
+from ..utils.urls import canonical_url
+
+class MetadataCache:
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: int = 3600,
+                 max_size: int = 100 * 1024 * 1024, save_interval: float = 5.0):
+        self._cache_dir = cache_dir or Path.home() / ".cache" / "vipedown" / "metadata"
+        self._index_file = self._cache_dir / "index.json"
+        self._ttl = ttl
+        self._max_size = max_size
+        # The index is rewritten at most once per save_interval; losing the
+        # last few changes in a crash only leaves stray entry files behind
+        self._save_interval = save_interval
+        self._saved = 0.0
+        self._dirty = False
+        self._lock = threading.Lock()
+        # Keys being extracted right now, see claim()
+        self._extracting: Set[str] = set()
+        self._extracted = threading.Condition(self._lock)
+        self._index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    @staticmethod
+    def make_key(url: str, variant: str = "") -> str:
+        return hashlib.sha1(f"{canonical_url(url)}\0{variant}".encode('utf-8')).hexdigest()
+
+    def get(self, url: str, variant: str = "") -> Optional[Dict[str, Any]]:
+        key = self.make_key(url, variant)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry):
+                self._drop(key)
+                self._save_index()
+                return None
+            try:
+                info = json.loads(self._entry_path(key).read_text(encoding='utf-8'))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+                self._drop(key)
+                self._save_index()
+                return None
+            # Access times only order eviction; not worth a write of their own
+            entry['accessed'] = time.time()
+            self._dirty = True
+            return info
+
+    def claim(self, url: str, variant: str = "", wait: float = 30.0) -> Optional[Dict[str, Any]]:
+        # get() for callers that extract on a miss. While another caller is
+        # extracting the same key this waits for its result (up to wait
+        # seconds) instead of extracting twice; on a miss the key counts as
+        # being extracted by this caller until it calls release()
+        key = self.make_key(url, variant)
+        deadline = time.monotonic() + wait
+        with self._lock:
+            while key in self._extracting:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._extracted.wait(remaining)
+            self._extracting.add(key)
+        info = self.get(url, variant)
+        if info is not None:
+            self.release(url, variant)
+        return info
+
+    def release(self, url: str, variant: str = "") -> None:
+        key = self.make_key(url, variant)
+        with self._lock:
+            self._extracting.discard(key)
+            self._extracted.notify_all()
+
+    def put(self, url: str, variant: str, info: Dict[str, Any]) -> None:
+        key = self.make_key(url, variant)
+        try:
+            data = json.dumps(info)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Info for {url} is not cacheable: {e}")
+            return
+
+        with self._lock:
+            try:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                atomic_write_text(self._entry_path(key), data)
+            except OSError as e:
+                logger.error(f"Failed to write metadata cache: {e}")
+                return
+            now = time.time()
+            self._index[key] = {
+                'url': canonical_url(url),
+                'title': info.get('title') or '',
+                'size': len(data),
+                'created': now,
+                'accessed': now
+            }
+            self._evict()
+            self._save_index()
+
+    def invalidate(self, url: str, variant: str = "") -> None:
+        key = self.make_key(url, variant)
+        with self._lock:
+            if key in self._index:
+                self._drop(key)
+                self._save_index()
+
+    def get_title(self, url: str) -> str:
+        # Any fresh variant of the URL carries the same title
+        url = canonical_url(url)
+        with self._lock:
+            for entry in self._index.values():
+                if entry['url'] == url and entry['title'] and not self._is_expired(entry):
+                    return entry['title']
+        return ""
+
+    def get_titles(self, urls: List[str]) -> Dict[str, str]:
+        # One pass over the index for a whole batch of URLs
+        wanted = {canonical_url(url): url for url in urls}
+        titles: Dict[str, str] = {}
+        with self._lock:
+            for entry in self._index.values():
+                url = wanted.get(entry['url'])
+                if url and entry['title'] and not self._is_expired(entry):
+                    titles[url] = entry['title']
+        return titles
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._index):
+                self._drop(key)
+            self._save_index(force=True)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty:
+                self._save_index(force=True)
+
+    def _evict(self) -> None:
+        for key in [k for k, entry in self._index.items() if self._is_expired(entry)]:
+            self._drop(key)
+
+        total_size = sum(entry['size'] for entry in self._index.values())
+        if total_size <= self._max_size:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k]['accessed']):
+            total_size -= self._index[key]['size']
+            self._drop(key)
+            if total_size <= self._max_size:
+                break
+
+    def _drop(self, key: str) -> None:
+        self._index.pop(key, None)
+        try:
+            self._entry_path(key).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to remove cache entry {key}: {e}")
+
+    def _is_expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['created'] > self._ttl
+
+    def _entry_path(self, key: str) -> Path:
+        return self._cache_dir / f"{key}.json"
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if self._index_file.exists():
+                return json.loads(self._index_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load metadata cache index: {e}")
+        return {}
+
+    def _save_index(self, force: bool = False) -> None:
+        self._dirty = True
+        now = time.monotonic()
+        if not force and now - self._saved < self._save_interval:
+            return
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._index_file, json.dumps(self._index))
+        except OSError as e:
+            logger.error(f"Failed to save metadata cache index: {e}")
+            return
+        self._dirty = False
+        self._saved = now
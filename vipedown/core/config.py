@@ -1,6 +1,6 @@
 from pathlib import Path
-from typing import Dict, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, List
+from dataclasses import dataclass, asdict, field
 from PyQt6.QtCore import QSettings
 import json
 
@@ -16,6 +16,29 @@ class AppConfig:
     auto_add_to_queue: bool = False
     minimize_to_tray: bool = True
     notify_on_complete: bool = True
+    metadata_cache_ttl: int = 3600
+    metadata_cache_size: int = 100 * 1024 * 1024
+    progress_rate: float = 10.0
+    playlist_workers: int = 3
+    # Bytes per second, 0 for unlimited. Schedule entries override the cap
+    # inside their window: {"start": "09:00", "end": "18:00", "limit": 2097152}
+    bandwidth_limit: int = 0
+    # Learn fragment concurrency and chunk size per host (kept in ~/.cache/vipedown)
+    adaptive_tuning: bool = True
+    # Skip videos already downloaded (index kept in ~/.config/vipedown/archive.jsonl)
+    use_download_archive: bool = True
+    # Store identical files once, as reflinks or hardlinks (needs the archive)
+    deduplicate: bool = True
+    # "threads" (one QThread per download), "asyncio" (DownloadOrchestrator)
+    # or "processes" (one worker process per download)
+    engine_backend: str = "threads"
+    # Seconds before a download is abandoned, 0 for no limit
+    job_timeout: int = 0
+    # Queued items resolved ahead of their turn (0 disables prefetching)
+    prefetch_depth: int = 2
+    # Resolve titles, durations and sizes of queued items in the background
+    resolve_queue_metadata: bool = True
+    bandwidth_schedule: List[Dict[str, Any]] = field(default_factory=list)
 
 class ConfigManager:
     def __init__(self):
@@ -0,0 +1,103 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+import errno
+import fcntl
+import os
+from loguru import logger
+
+from .archive import DownloadArchive
+
+# linux/fs.h: share the source file's extents with the destination (btrfs, XFS)
+FICLONE = 0x40049409
+
+def reflink(source: Path, target: Path) -> bool:
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError as e:
+        if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.EBADF):
+            logger.warning(f"Reflink {source} -> {target} failed: {e}")
+        try:
+            os.unlink(target)
+        except OSError:
+            pass
+        return False
+
+def link_file(source: Path, target: Path) -> Optional[str]:
+    # Replaces target with a reflink (independent copy-on-write file) or,
+    # failing that, a hardlink to source. Returns the method used, or None
+    # when neither works (e.g. different filesystems)
+    tmp_path = target.with_name(f".{target.name}.dedup")
+    method = None
+    if reflink(source, tmp_path):
+        method = 'reflink'
+    else:
+        try:
+            os.link(source, tmp_path)
+            method = 'hardlink'
+        except OSError as e:
+            logger.debug(f"Cannot link {source} -> {target}: {e}")
+            return None
+    try:
+        os.replace(tmp_path, target)
+    except OSError as e:
+        logger.error(f"Failed to replace {target} with a link: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return None
+    return method
+
+class Deduplicator:
+    # Stores identical media once. A fresh download whose checksum matches
+    # an archived file is swapped for a link to that file; a video already
+    # archived under its extractor id is linked to where it was requested
+    # instead of being downloaded again.
+
+    def __init__(self, archive: DownloadArchive):
+        self._archive = archive
+
+    def deduplicate(self, archive_id: str) -> int:
+        # Returns the number of bytes saved
+        entry = self._archive.get(archive_id)
+        if not entry or not entry.get('sha256'):
+            return 0
+        path = Path(entry['path'])
+        for original in self._archive.find_by_checksum(entry['sha256'], entry['size']):
+            if original['id'] == archive_id or not self._usable(original, path):
+                continue
+            method = link_file(Path(original['path']), path)
+            if method:
+                logger.info(f"{path} is a duplicate of {original['path']} ({method})")
+                self._archive.mark_duplicate(archive_id, original['id'])
+                return entry['size']
+        return 0
+
+    def materialize(self, archive_id: str, target: Path) -> bool:
+        # Puts an archived video at target (e.g. another playlist folder)
+        entry = self._archive.get(archive_id)
+        if not entry or not entry['path'] or target.exists():
+            return False
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to create {target.parent}: {e}")
+            return False
+        method = link_file(Path(entry['path']), target)
+        if method is None:
+            return False
+        logger.info(f"Linked archived {entry['path']} to {target} ({method})")
+        self._archive.add_copy(archive_id, str(target))
+        return True
+
+    def space_saved(self) -> int:
+        return self._archive.space_saved()
+
+    @staticmethod
+    def _usable(original: Dict[str, Any], path: Path) -> bool:
+        try:
+            return os.path.exists(original['path']) and not os.path.samefile(original['path'], path)
+        except OSError:
+            return False
@@ -1,11 +1,22 @@
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable, Set
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt6.QtCore import QObject, pyqtSignal
 import yt_dlp
+from yt_dlp.utils import PlaylistEntries, format_bytes
 from loguru import logger
+import threading
 import re
 
+from .cache import MetadataCache
+from .progress import ProgressThrottle
+from .pool import YoutubeDLPool
+from .bandwidth import BandwidthGovernor
+from .tuning import HostTuner
+from .archive import DownloadArchive
+from .dedup import Deduplicator
+
 @dataclass
 class PlaylistInfo:
     title: str
@@ -17,15 +28,48 @@ class PlaylistInfo:
 
     @classmethod
     def from_dict(cls, info_dict: Dict[str, Any]) -> 'PlaylistInfo':
+        entries = info_dict.get('entries') or []
+        # Unprocessed playlists carry a lazy iterable; never drain it just to count
+        entry_count = len(entries) if isinstance(entries, list) else info_dict.get('playlist_count') or 0
         return cls(
             title=info_dict.get('title', 'Unknown Playlist'),
             uploader=info_dict.get('uploader', 'Unknown'),
             description=info_dict.get('description', ''),
-            entries=info_dict.get('entries', []),
-            entry_count=len(info_dict.get('entries', [])),
+            entries=entries,
+            entry_count=entry_count,
             webpage_url=info_dict.get('webpage_url', '')
         )
 
+class YtdlLogger:
+    # Route yt-dlp's console output through loguru so stdout stays free for
+    # the headless mode's machine-readable events
+    THROTTLED = re.compile(r'HTTP Error (429|403)')
+
+    def __init__(self, on_throttled: Optional[Callable[[int], None]] = None):
+        self._on_throttled = on_throttled
+
+    def debug(self, msg: str):
+        if msg.startswith('[debug] '):
+            logger.debug(msg)
+        else:
+            logger.info(msg)
+
+    def info(self, msg: str):
+        logger.info(msg)
+
+    def warning(self, msg: str):
+        logger.warning(msg)
+        self._check_throttled(msg)
+
+    def error(self, msg: str):
+        logger.error(msg)
+        self._check_throttled(msg)
+
+    def _check_throttled(self, msg: str):
+        match = self.THROTTLED.search(msg)
+        if match and self._on_throttled:
+            self._on_throttled(int(match.group(1)))
+
 @dataclass
 class DownloadConfig:
     url: str
@@ -41,6 +85,11 @@ class DownloadConfig:
     playlist_end: Optional[int] = None
     playlist_items: str = ""
     create_playlist_folder: bool = True
+    playlist_workers: int = 3
+    entry_attempts: int = 3
+    rate_limit: int = 0
+    # Give up on the whole job after this many seconds (0: no limit)
+    timeout: float = 0
 
 class VipeDownloader(QObject):
     progress = pyqtSignal(dict)
@@ -49,22 +98,61 @@ class VipeDownloader(QObject):
     info = pyqtSignal(dict)
     playlist_progress = pyqtSignal(dict)
 
-    def __init__(self):
+    def __init__(self, cache: Optional[MetadataCache] = None, progress_rate: float = 10.0,
+                 pool: Optional[YoutubeDLPool] = None,
+                 governor: Optional[BandwidthGovernor] = None,
+                 tuner: Optional[HostTuner] = None,
+                 archive: Optional[DownloadArchive] = None,
+                 dedup: Optional[Deduplicator] = None):
         super().__init__()
+        self._cache = cache
+        self._archive = archive
+        self._dedup = dedup
+        self._bytes_saved = 0
+        self._governor = governor
+        self._tuner = tuner
+        self._tuning_url = ""
+        # Set while the formats being downloaded come from the metadata cache
+        self._cached_formats = False
+        # Progress hooks run on playlist entry and fragment threads
+        self._hook_lock = threading.Lock()
+        self._fragmented: Set[str] = set()
+        self._bytes_seen: Dict[str, float] = {}
+        # Without a shared pool nothing is kept idle, so instances close on release
+        self._pool = pool or YoutubeDLPool(max_idle=0)
+        self._throttle = ProgressThrottle(progress_rate)
         self._ydl = None
         self._active = False
         self._current_item = 0
         self._total_items = 0
+        self._ydl_opts: Dict[str, Any] = {}
+        self._entry_local = threading.local()
+        self._entry_ydls: List[yt_dlp.YoutubeDL] = []
+        self._job_ydl: Optional[yt_dlp.YoutubeDL] = None
+        self._entry_lock = threading.Lock()
+        self._entry_states: Dict[int, Dict[str, Any]] = {}
+        self._entry_counts: Dict[str, int] = {}
+        self._playlist_duration = 0
+        self._expected_items = 0
+        self._enumerating = False
 
     def download(self, config: DownloadConfig):
         try:
             self._active = True
-            ydl_opts = self._create_options(config)
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                self._ydl = ydl
+            self._tuning_url = config.url
+            self._ydl_opts = self._create_options(config)
+            if self._governor:
+                self._governor.register(self, config.rate_limit)
+
+            ydl = self._pool.acquire(self._ydl_opts)
+            self._ydl = ydl
+            try:
                 self._extract_and_download(config, ydl)
-                
+            finally:
+                self._pool.release(ydl)
+
+        except yt_dlp.utils.DownloadCancelled:
+            logger.info(f"Download cancelled: {config.url}")
         except Exception as e:
             logger.exception("Download failed")
             self.error.emit(str(e))
@@ -74,41 +162,333 @@ class VipeDownloader(QObject):
 
     def _extract_and_download(self, config: DownloadConfig, ydl: yt_dlp.YoutubeDL):
         try:
-            info = ydl.extract_info(config.url, download=False)
+            archive_id = self._archived_id(ydl, url=config.url)
+            if archive_id:
+                self._complete_archived(config, ydl, archive_id, {})
+                return
+
+            if config.playlist:
+                # Enumerate without resolving entries; workers resolve them as
+                # they go, so the first download doesn't wait on the whole list
+                info = ydl.extract_info(config.url, download=False, process=False)
+                if not info or not self._active:
+                    return
+                if info.get('_type') in ('playlist', 'multi_video'):
+                    self._download_playlist(config, ydl, info, resolved=False)
+                    return
+                info, from_cache = ydl.process_ie_result(info, download=False), False
+            else:
+                info, from_cache = self._extract_info(config, ydl)
             if not info or not self._active:
                 return
+            self._cached_formats = from_cache
 
             if info.get('_type') == 'playlist':
-                self._handle_playlist(config, ydl, info)
-            else:
-                self._handle_single_video(info)
+                self._download_playlist(config, ydl, info, resolved=True)
+                return
+
+            archive_id = self._archived_id(ydl, info=info)
+            if archive_id:
+                self._complete_archived(config, ydl, archive_id, info)
+                return
+
+            self._handle_single_video(info)
 
             if self._active:
-                ydl.download([config.url])
-                self.completed.emit(True, "Download completed successfully")
+                # Feed the already extracted info back into yt-dlp instead of
+                # ydl.download([url]), which would run the extractor again
+                result = ydl.process_ie_result(info, download=True)
+                if from_cache and ydl._download_retcode and self._active:
+                    # Cached format URLs may have expired; retry with fresh metadata
+                    logger.info(f"Cached info failed, re-extracting: {config.url}")
+                    self._cache.invalidate(config.url, self._cache_variant(config))
+                    ydl._download_retcode = 0
+                    self._cached_formats = False
+                    info, _ = self._extract_info(config, ydl)
+                    if not info or not self._active:
+                        return
+                    result = ydl.process_ie_result(info, download=True)
+                saved = 0 if ydl._download_retcode else self._record_archive(ydl, result)
+                if saved:
+                    self.completed.emit(
+                        True, f"Download completed successfully (duplicate of an existing file, "
+                              f"{format_bytes(saved)} saved)"
+                    )
+                else:
+                    self.completed.emit(True, "Download completed successfully")
 
         except yt_dlp.utils.DownloadError as e:
             self.error.emit(str(e))
             self.completed.emit(False, str(e))
 
+    def _archived_id(self, ydl: yt_dlp.YoutubeDL, url: Optional[str] = None,
+                     info: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        # The archive id of an already downloaded video, None otherwise
+        if self._archive is None:
+            return None
+        if info is not None:
+            archive_id = ydl._make_archive_id(info)
+            return archive_id if archive_id and archive_id in self._archive else None
+        # Most extractors can tell the video id from the URL alone, which
+        # lets an archived video skip extraction entirely
+        for key, ie in ydl._ies.items():
+            if ie.suitable(url):
+                temp_id = ie.get_temp_id(url)
+                archive_id = yt_dlp.utils.make_archive_id(key, temp_id) if temp_id else None
+                return archive_id if archive_id and archive_id in self._archive else None
+        return None
+
+    def _record_archive(self, ydl: yt_dlp.YoutubeDL, info: Optional[Dict[str, Any]]) -> int:
+        # Returns the bytes saved when the new file turned out to be a duplicate
+        if self._archive is None or not info:
+            return 0
+        downloads = info.get('requested_downloads') or [info]
+        path = downloads[-1].get('filepath')
+        archive_id = ydl._make_archive_id(info)
+        if not path or not archive_id:
+            return 0
+        self._archive.record(archive_id, path)
+        return self._dedup.deduplicate(archive_id) if self._dedup else 0
+
+    def _complete_archived(self, config: DownloadConfig, ydl: yt_dlp.YoutubeDL,
+                           archive_id: str, info: Dict[str, Any]):
+        saved = self._link_archived(ydl, archive_id, info)
+        if saved:
+            self.completed.emit(
+                True, f"Already downloaded; linked into {config.output_path} ({format_bytes(saved)} saved)"
+            )
+        else:
+            self.completed.emit(True, "Already downloaded (in archive)")
+
+    def _link_archived(self, ydl: yt_dlp.YoutubeDL, archive_id: str, info: Dict[str, Any]) -> int:
+        # The same video requested into another folder gets a link there
+        # instead of a second download. Returns the bytes saved
+        if self._dedup is None:
+            return 0
+        entry = self._archive.get(archive_id)
+        if not entry or not entry['path']:
+            return 0
+        # Only the folder depends on this request, which may not be resolved
+        # yet; the file keeps the name it was archived under
+        target = Path(ydl.prepare_filename(info)).parent / Path(entry['path']).name
+        return entry['size'] if self._dedup.materialize(archive_id, target) else 0
+
+    def _extract_info(self, config: DownloadConfig, ydl: yt_dlp.YoutubeDL):
+        variant = self._cache_variant(config)
+        if not self._cache:
+            return ydl.extract_info(config.url, download=False), False
+
+        # Waits for a prefetch of the same item that is still running
+        info = self._cache.claim(config.url, variant)
+        if info:
+            logger.info(f"Using cached info for {config.url}")
+            return info, True
+        try:
+            info = ydl.extract_info(config.url, download=False)
+            if info:
+                self._cache.put(config.url, variant, ydl.sanitize_info(info))
+            return info, False
+        finally:
+            self._cache.release(config.url, variant)
+
+    def _cache_variant(self, config: DownloadConfig) -> str:
+        # Everything that changes the processed info: format selection and,
+        # for playlists, which entries were requested
+        variant = self._get_format_string(config)
+        if config.playlist:
+            playlist_range = f"{config.playlist_start}:{config.playlist_end or ''}"
+            variant += f"|{config.playlist_items or playlist_range}"
+        return variant
+
+    def _download_playlist(self, config: DownloadConfig, ydl: yt_dlp.YoutubeDL,
+                           info: Dict[str, Any], resolved: bool):
+        self._handle_playlist(config, ydl, info)
+        if not self._active:
+            return
+        self._bytes_saved = 0
+        failed = self._download_playlist_entries(config, ydl, info, resolved)
+        saved = f"; {format_bytes(self._bytes_saved)} saved by deduplication" if self._bytes_saved else ""
+        if failed:
+            self.completed.emit(False, f"{failed} of {self._total_items} playlist entries failed{saved}")
+        else:
+            self.completed.emit(True, f"Download completed successfully{saved}")
+
     def _handle_playlist(self, config: DownloadConfig, ydl: yt_dlp.YoutubeDL, info: Dict[str, Any]):
         playlist_info = PlaylistInfo.from_dict(info)
         self._total_items = playlist_info.entry_count
         
+        # Lazily enumerated playlists report their duration as entries arrive
+        entries = playlist_info.entries if isinstance(playlist_info.entries, list) else []
         self.info.emit({
             'type': 'playlist',
             'title': playlist_info.title,
             'uploader': playlist_info.uploader,
             'total_entries': playlist_info.entry_count,
-            'duration': sum(entry.get('duration', 0) for entry in playlist_info.entries if entry)
+            'duration': sum(entry.get('duration') or 0 for entry in entries if entry)
         })
-        
-        if config.create_playlist_folder:
-            playlist_path = config.output_path / self._sanitize_filename(playlist_info.title)
-            playlist_path.mkdir(parents=True, exist_ok=True)
-            ydl_opts = ydl.params
-            ydl_opts['outtmpl'] = str(playlist_path / '%(title)s.%(ext)s')
-            self._ydl = yt_dlp.YoutubeDL(ydl_opts)
+
+    def _download_playlist_entries(self, config: DownloadConfig, ydl: yt_dlp.YoutubeDL,
+                                   info: Dict[str, Any], resolved: bool) -> int:
+        # Entries are handed to a bounded pool as they are enumerated; every
+        # worker thread owns its own YoutubeDL (instances aren't thread-safe)
+        if resolved:
+            # Processed info already holds exactly the requested entries
+            entries = (
+                (entry.get('playlist_index') or position, entry) if entry else (position, entry)
+                for position, entry in enumerate(info.get('entries') or [], start=1)
+            )
+            self._expected_items = len(info.get('entries') or [])
+            # Nothing left to enumerate, so the job's instance would sit idle
+            self._job_ydl = ydl
+        else:
+            entries = PlaylistEntries(ydl, info).get_requested_items()
+            # The full count is only a useful estimate when no range was requested
+            ranged = config.playlist_items or config.playlist_start > 1 or config.playlist_end
+            known = len(info['entries']) if isinstance(info.get('entries'), list) else 0
+            self._expected_items = 0 if ranged else info.get('playlist_count') or known
+        extra = ydl._playlist_infodict(info)
+        playlist_url = info.get('webpage_url')
+        workers = max(1, config.playlist_workers)
+
+        with self._entry_lock:
+            self._entry_states = {}
+            self._entry_counts = {'pending': 0, 'downloading': 0, 'completed': 0, 'failed': 0, 'skipped': 0}
+            self._playlist_duration = 0
+            self._enumerating = True
+        self._emit_playlist_progress(info.get('title', ''))
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vipedown-entry")
+        # Stay a little ahead of the workers instead of draining the playlist
+        slots = threading.Semaphore(workers * 2)
+        futures = []
+        try:
+            for autonumber, (index, entry) in enumerate(entries, start=1):
+                self._add_entry_state(index, entry)
+                if not entry:
+                    continue
+                while not slots.acquire(timeout=0.2):
+                    if not self._active:
+                        raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+                if not self._active:
+                    raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+                entry_extra = {**extra, 'playlist_index': index, 'playlist_autonumber': autonumber}
+                future = executor.submit(self._download_entry, config, index, entry, entry_extra, playlist_url)
+                future.add_done_callback(lambda _: slots.release())
+                futures.append(future)
+
+            with self._entry_lock:
+                self._enumerating = False
+                self._total_items = len(self._entry_states)
+            self._emit_playlist_progress(info.get('title', ''))
+            for future in as_completed(futures):
+                future.result()
+        except yt_dlp.utils.DownloadCancelled:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            for entry_ydl in self._entry_ydls:
+                self._pool.release(entry_ydl)
+            self._entry_ydls = []
+            self._job_ydl = None
+            self._enumerating = False
+
+        return self._entry_counts['failed']
+
+    def _download_entry(self, config: DownloadConfig, index: int, entry: Dict[str, Any],
+                        extra: Dict[str, Any], playlist_url: Optional[str] = None):
+        ydl = self._get_entry_ydl()
+        archive_id = self._archived_id(ydl, info=entry)
+        if archive_id:
+            saved = self._link_archived(ydl, archive_id, {**entry, **extra})
+            with self._entry_lock:
+                self._bytes_saved += saved
+            self._set_entry_state(index, status='skipped', error='')
+            return
+        for attempt in range(1, max(1, config.entry_attempts) + 1):
+            if not self._active:
+                raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+            self._set_entry_state(index, status='downloading', attempts=attempt)
+            ydl._download_retcode = 0
+            try:
+                entry_url = entry.get('webpage_url')
+                if attempt > 1 and entry.get('formats') and entry_url and entry_url != playlist_url:
+                    # A resolved entry may have failed on stale format URLs;
+                    # flat (url) entries are re-extracted on every attempt anyway
+                    result = ydl.extract_info(entry_url, download=True, extra_info=extra)
+                else:
+                    result = ydl.process_ie_result(entry, download=True, extra_info=extra)
+                if not ydl._download_retcode:
+                    saved = self._record_archive(ydl, result)
+                    with self._entry_lock:
+                        self._bytes_saved += saved
+                    self._set_entry_state(index, status='completed', error='')
+                    return
+                error = "yt-dlp reported an error"
+            except yt_dlp.utils.DownloadCancelled:
+                raise
+            except Exception as e:
+                error = str(e)
+            logger.warning(f"Playlist entry {index} attempt {attempt} failed: {error}")
+            with self._entry_lock:
+                self._entry_states[index]['error'] = error
+        self._set_entry_state(index, status='failed')
+
+    def _get_entry_ydl(self) -> yt_dlp.YoutubeDL:
+        ydl = getattr(self._entry_local, 'ydl', None)
+        if ydl is None:
+            # When the job's own instance is idle, the first pool thread
+            # borrows it; only extra workers pay for a new one
+            with self._entry_lock:
+                ydl, self._job_ydl = self._job_ydl, None
+            if ydl is None:
+                ydl = self._pool.acquire(self._ydl_opts)
+                with self._entry_lock:
+                    self._entry_ydls.append(ydl)
+            self._entry_local.ydl = ydl
+        return ydl
+
+    def _add_entry_state(self, index: int, entry: Optional[Dict[str, Any]]):
+        status = 'pending' if entry else 'failed'
+        title = (entry or {}).get('title') or (entry or {}).get('url', '')
+        with self._entry_lock:
+            self._entry_states[index] = {
+                'status': status, 'attempts': 0, 'title': title,
+                'error': '' if entry else 'Extraction failed'
+            }
+            self._entry_counts[status] += 1
+            self._playlist_duration += (entry or {}).get('duration') or 0
+            self._total_items = max(len(self._entry_states), self._expected_items)
+            report = self._enumerating and (not entry or len(self._entry_states) % 50 == 0)
+        if report:
+            self._emit_playlist_progress(title, index)
+
+    def _set_entry_state(self, index: int, **changes):
+        with self._entry_lock:
+            state = self._entry_states[index]
+            if 'status' in changes:
+                self._entry_counts[state['status']] -= 1
+                self._entry_counts[changes['status']] += 1
+            state.update(changes)
+            title = state['title']
+        self._emit_playlist_progress(title, index)
+
+    def _emit_playlist_progress(self, title: str, index: int = 0):
+        with self._entry_lock:
+            counts = dict(self._entry_counts)
+            progress = {
+                'current': counts['completed'] + counts['failed'] + counts['skipped'],
+                'total': self._total_items,
+                'completed': counts['completed'],
+                'failed': counts['failed'],
+                'skipped': counts['skipped'],
+                'active': counts['downloading'],
+                'enumerating': self._enumerating,
+                'duration': self._playlist_duration,
+                'index': index,
+                'title': title
+            }
+        self.playlist_progress.emit(progress)
 
     def _handle_single_video(self, info: Dict[str, Any]):
         self.info.emit({
@@ -120,8 +500,9 @@ class VipeDownloader(QObject):
 
     def _create_options(self, config: DownloadConfig) -> Dict[str, Any]:
         if config.playlist and config.create_playlist_folder:
-            # Will be updated with playlist name after extraction
-            output_template = str(config.output_path / '%(playlist_title)s' / '%(title)s.%(ext)s')
+            # yt-dlp fills in (and sanitizes) the playlist title per entry; the
+            # empty default keeps single videos out of an "NA" folder
+            output_template = str(config.output_path / '%(playlist_title|)s' / '%(title)s.%(ext)s')
         else:
             output_template = str(config.output_path / '%(title)s.%(ext)s')
         
@@ -129,6 +510,8 @@ class VipeDownloader(QObject):
             'format': self._get_format_string(config),
             'outtmpl': output_template,
             'progress_hooks': [self._handle_progress],
+            'logger': YtdlLogger(self._on_throttled),
+            'download_archive': self._archive,
             'merge_output_format': 'mp4',
             'writethumbnail': False,
             'writeinfojson': False,
@@ -140,6 +523,8 @@ class VipeDownloader(QObject):
             'concurrent_fragment_downloads': 5,
             'http_chunk_size': 10485760
         }
+        if self._tuner:
+            ydl_opts.update(self._tuner.options_for(config.url))
 
         # Playlist specific options
         if config.playlist:
@@ -162,8 +547,21 @@ class VipeDownloader(QObject):
 
     def _handle_progress(self, d: Dict[str, Any]):
         if not self._active:
-            raise Exception("Download cancelled")
-            
+            # DownloadCancelled is not swallowed by ignoreerrors, so this
+            # aborts the whole job (including remaining playlist entries)
+            raise yt_dlp.utils.DownloadCancelled("Download cancelled")
+
+        if self._governor and d['status'] == 'downloading':
+            self._pace(d)
+        if self._tuner:
+            self._sample(d)
+
+        # Drop hook calls above the configured rate before doing any work;
+        # status changes (and so the final 'finished' event) always pass
+        state = f"{d['status']}:{d.get('postprocessor', '')}"
+        if not self._throttle.allow(d.get('filename', ''), state):
+            return
+
         if d['status'] == 'downloading':
             try:
                 # Get total bytes accurately
@@ -202,6 +600,10 @@ class VipeDownloader(QObject):
                     'fragment_info': fragment_info,
                     'phase': 'Downloading',
                 }
+                playlist_index = (d.get('info_dict') or {}).get('playlist_index')
+                if playlist_index:
+                    progress['playlist_index'] = playlist_index
+                    progress['playlist_count'] = self._total_items
                 self.progress.emit(progress)
                 
             except Exception as e:
@@ -258,15 +660,72 @@ class VipeDownloader(QObject):
         }
         return quality_map.get(config.quality, 'bestvideo+bestaudio/best')
 
-    @staticmethod
-    def _sanitize_filename(filename: str) -> str:
-        return re.sub(r'[<>:"/\\|?*]', '_', filename)
+    def _pace(self, d: Dict[str, Any]):
+        # The hook runs after every block yt-dlp reads; blocking here until
+        # the bucket covers the new bytes is what enforces the limit
+        filename = d.get('filename', '')
+        downloaded = float(d.get('downloaded_bytes') or 0)
+        with self._hook_lock:
+            previous = self._bytes_seen.get(filename)
+            self._bytes_seen[filename] = downloaded
+        # The first report includes whatever was resumed from disk
+        if previous is not None and downloaded > previous:
+            self._governor.throttle(self, int(downloaded - previous), lambda: self._active)
+
+    def _sample(self, d: Dict[str, Any]):
+        filename = d.get('filename', '')
+        if d['status'] == 'downloading' and d.get('fragment_count'):
+            with self._hook_lock:
+                self._fragmented.add(filename)
+        elif d['status'] == 'finished' and d.get('elapsed'):
+            # A capped download measures our limit, not the host
+            if self._governor and self._governor.rate_of(self):
+                return
+            size = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+            with self._hook_lock:
+                fragmented = filename in self._fragmented
+            self._tuner.record_sample(self._tuning_url, size, d['elapsed'], fragmented)
+
+    def _on_throttled(self, status: int):
+        # A 403 on cached formats is most likely an expired URL, which the
+        # fresh extraction that follows fixes; it says nothing about the host
+        if status == 403 and self._cached_formats:
+            return
+        if self._tuner:
+            self._tuner.record_throttled(self._tuning_url, status)
+
+    def prefetch(self, config: DownloadConfig, summary: bool = False) -> Optional[Dict[str, Any]]:
+        # Extraction only: the info is left in the metadata cache under the
+        # key download() looks up, so the download skips it. Without a cache
+        # that is only worth it to a caller after the summary
+        if config.playlist or (self._cache is None and not summary):
+            return None
+        ydl = self._pool.acquire(self._create_options(config))
+        try:
+            info, _ = self._extract_info(config, ydl)
+            return info
+        except Exception as e:
+            logger.warning(f"Prefetch failed for {config.url}: {e}")
+            return None
+        finally:
+            self._pool.release(ydl)
+
+    def set_rate_limit(self, limit: int):
+        if self._governor:
+            self._governor.set_item_limit(self, limit)
 
     def _cleanup(self):
+        if self._governor:
+            self._governor.unregister(self)
+        with self._hook_lock:
+            self._bytes_seen.clear()
+            self._fragmented.clear()
+        self._cached_formats = False
         self._active = False
         self._ydl = None
         self._current_item = 0
         self._total_items = 0
+        self._throttle.reset()
 
     def cancel(self):
         self._active = False
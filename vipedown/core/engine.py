@@ -0,0 +1,228 @@
+from typing import Dict, List, Optional, Set
+from PyQt6.QtCore import QObject, QThread, QTimer, Qt, pyqtSignal, pyqtSlot
+from loguru import logger
+import multiprocessing
+
+from .downloader import VipeDownloader, DownloadConfig
+from .cache import MetadataCache
+from .pool import YoutubeDLPool
+from .bandwidth import BandwidthGovernor
+from .tuning import HostTuner
+from .archive import DownloadArchive
+from .dedup import Deduplicator
+
+class DownloadWorker(QThread):
+    progress = pyqtSignal(str, dict)
+    info = pyqtSignal(str, dict)
+    playlist_progress = pyqtSignal(str, dict)
+    completed = pyqtSignal(str, bool, str)
+    paused = pyqtSignal(str)
+    error = pyqtSignal(str, str)
+
+    def __init__(self, job_id: str, config: DownloadConfig,
+                 cache: Optional[MetadataCache] = None, progress_rate: float = 10.0,
+                 pool: Optional[YoutubeDLPool] = None, governor: Optional[BandwidthGovernor] = None,
+                 tuner: Optional[HostTuner] = None, archive: Optional[DownloadArchive] = None,
+                 dedup: Optional[Deduplicator] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.job_id = job_id
+        self.config = config
+        self.downloader = VipeDownloader(cache, progress_rate, pool, governor, tuner, archive, dedup)
+        self._cancelled = False
+        self._paused = False
+        self._timed_out = False
+        self._completion_sent = False
+
+        # The downloader emits from inside run(); queue everything back onto
+        # the thread that owns this worker (the GUI thread).
+        queued = Qt.ConnectionType.QueuedConnection
+        self.downloader.progress.connect(self._on_progress, queued)
+        self.downloader.info.connect(self._on_info, queued)
+        self.downloader.playlist_progress.connect(self._on_playlist_progress, queued)
+        self.downloader.completed.connect(self._on_completed, queued)
+        self.downloader.error.connect(self._on_error, queued)
+        self.finished.connect(self._on_finished)
+
+        if config.timeout:
+            self._timeout_timer = QTimer(self)
+            self._timeout_timer.setSingleShot(True)
+            self._timeout_timer.timeout.connect(self.time_out)
+            self._timeout_timer.start(int(config.timeout * 1000))
+
+    def run(self):
+        self.downloader.download(self.config)
+
+    def cancel(self):
+        self._cancelled = True
+        self.downloader.cancel()
+
+    def time_out(self):
+        self._timed_out = True
+        self.cancel()
+
+    def pause(self):
+        # Stops like cancel(), but the job reports paused instead of failed.
+        # yt-dlp leaves the .part file (and fragment state) behind, and
+        # continuedl picks it up from the last byte on the next run.
+        self._paused = True
+        self.downloader.cancel()
+
+    @pyqtSlot(dict)
+    def _on_progress(self, progress: dict):
+        self.progress.emit(self.job_id, progress)
+
+    @pyqtSlot(dict)
+    def _on_info(self, info: dict):
+        self.info.emit(self.job_id, info)
+
+    @pyqtSlot(dict)
+    def _on_playlist_progress(self, progress: dict):
+        self.playlist_progress.emit(self.job_id, progress)
+
+    @pyqtSlot(bool, str)
+    def _on_completed(self, success: bool, message: str):
+        if self._completion_sent:
+            return
+        self._completion_sent = True
+        if self._paused and not success:
+            self.paused.emit(self.job_id)
+        else:
+            self.completed.emit(self.job_id, success, message)
+
+    @pyqtSlot(str)
+    def _on_error(self, message: str):
+        if not self._cancelled:
+            self.error.emit(self.job_id, message)
+
+    @pyqtSlot()
+    def _on_finished(self):
+        # The downloader returns silently when cancelled or when extraction
+        # yields nothing; make sure every job reports exactly one completion.
+        if not self._completion_sent:
+            if self._timed_out:
+                message = f"Timed out after {self.config.timeout:g}s"
+            elif self._cancelled:
+                message = "Download cancelled"
+            else:
+                message = "No downloadable media found"
+            self._on_completed(False, message)
+
+class DownloadEngine(QObject):
+    progress = pyqtSignal(str, dict)
+    info = pyqtSignal(str, dict)
+    playlist_progress = pyqtSignal(str, dict)
+    completed = pyqtSignal(str, bool, str)
+    paused = pyqtSignal(str)
+    error = pyqtSignal(str, str)
+
+    def __init__(self, parent: Optional[QObject] = None, cache: Optional[MetadataCache] = None,
+                 progress_rate: float = 10.0, pool: Optional[YoutubeDLPool] = None,
+                 governor: Optional[BandwidthGovernor] = None, tuner: Optional[HostTuner] = None,
+                 archive: Optional[DownloadArchive] = None, dedup: Optional[Deduplicator] = None):
+        super().__init__(parent)
+        self._cache = cache
+        self._progress_rate = progress_rate
+        # Shared by every worker so queue items reuse warm YoutubeDL sessions
+        self._pool = pool or YoutubeDLPool()
+        self.governor = governor or BandwidthGovernor()
+        self._tuner = tuner
+        self._archive = archive
+        self.dedup = dedup
+        # Runs extraction for the prefetch stage; never downloads
+        self._extractor = VipeDownloader(cache, progress_rate, self._pool, tuner=tuner, archive=archive)
+        self._workers: Dict[str, DownloadWorker] = {}
+        # Workers report completion slightly before their thread exits;
+        # keep them until then so shutdown can wait on every live thread
+        self._threads: Set[DownloadWorker] = set()
+
+    def start(self, job_id: str, config: DownloadConfig) -> None:
+        if job_id in self._workers:
+            logger.warning(f"Job already running: {job_id}")
+            return
+
+        worker = DownloadWorker(
+            job_id, config, self._cache, self._progress_rate, self._pool, self.governor,
+            self._tuner, self._archive, self.dedup, self
+        )
+        worker.progress.connect(self.progress)
+        worker.info.connect(self.info)
+        worker.playlist_progress.connect(self.playlist_progress)
+        worker.completed.connect(self._on_worker_completed)
+        worker.paused.connect(self._on_worker_paused)
+        worker.error.connect(self.error)
+        worker.finished.connect(lambda: self._threads.discard(worker))
+        worker.finished.connect(worker.deleteLater)
+        self._workers[job_id] = worker
+        self._threads.add(worker)
+        worker.start()
+
+    def prefetch(self, config: DownloadConfig, summary: bool = False) -> Optional[dict]:
+        # Safe to call from any thread
+        return self._extractor.prefetch(config, summary)
+
+    def cancel(self, job_id: str) -> None:
+        worker = self._workers.get(job_id)
+        if worker:
+            worker.cancel()
+
+    def pause(self, job_id: str) -> None:
+        worker = self._workers.get(job_id)
+        if worker:
+            worker.pause()
+
+    def pause_all(self) -> None:
+        for worker in list(self._workers.values()):
+            worker.pause()
+
+    def set_rate_limit(self, job_id: str, limit: int) -> None:
+        worker = self._workers.get(job_id)
+        if worker:
+            worker.downloader.set_rate_limit(limit)
+
+    def cancel_all(self) -> None:
+        for worker in list(self._workers.values()):
+            worker.cancel()
+
+    def is_running(self, job_id: str) -> bool:
+        return job_id in self._workers
+
+    def active_jobs(self) -> List[str]:
+        return list(self._workers)
+
+    def active_count(self) -> int:
+        return len(self._workers)
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        self.cancel_all()
+        for worker in list(self._threads):
+            if not worker.wait(timeout_ms):
+                logger.warning(f"Worker did not stop in time: {worker.job_id}")
+        self._workers.clear()
+        self._pool.close()
+
+    @pyqtSlot(str, bool, str)
+    def _on_worker_completed(self, job_id: str, success: bool, message: str):
+        self._workers.pop(job_id, None)
+        self.completed.emit(job_id, success, message)
+
+    @pyqtSlot(str)
+    def _on_worker_paused(self, job_id: str):
+        self._workers.pop(job_id, None)
+        self.paused.emit(job_id)
+
+def create_engine(backend: str = "threads", parent: Optional[QObject] = None, **kwargs) -> DownloadEngine:
+    # "threads": one QThread per job; "asyncio": jobs scheduled by
+    # DownloadOrchestrator; "processes": one worker process per job
+    if backend == "asyncio":
+        from .orchestrator import DownloadOrchestrator
+        return DownloadOrchestrator(parent, **kwargs)
+    if backend == "processes":
+        # A daemonic process (e.g. when embedded) may not start children
+        if multiprocessing.current_process().daemon:
+            logger.warning("Worker processes are not available in a daemon process, using threads")
+            return DownloadEngine(parent, **kwargs)
+        from .process_pool import ProcessDownloadEngine
+        return ProcessDownloadEngine(parent, **kwargs)
+    if backend != "threads":
+        logger.warning(f"Unknown engine backend {backend!r}, using threads")
+    return DownloadEngine(parent, **kwargs)
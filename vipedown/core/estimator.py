@@ -0,0 +1,102 @@
+from typing import Dict, Optional, Tuple
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import time
+
+from .queue_manager import QueueManager, DownloadStatus
+
+class QueueEstimator(QObject):
+    # Queue-wide ETA: bytes still to download across every unfinished item,
+    # divided by the aggregate throughput of all running downloads smoothed
+    # with an EWMA. Sizes come from what running downloads report and, for
+    # items that have not started, from the size resolved in the background.
+    # Items whose size is unknown (e.g. playlists) are counted separately
+    # rather than guessed.
+    updated = pyqtSignal()
+
+    def __init__(self, queue_manager: QueueManager, smoothing: float = 0.2,
+                 interval_ms: int = 1000, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.queue_manager = queue_manager
+        self._smoothing = smoothing
+        # item id -> filename -> (downloaded, total) for the files seen so far
+        self._files: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        self._bytes = 0.0
+        self._rate = 0.0
+        self._sampled = time.monotonic()
+        self._sample_timer = QTimer(self)
+        self._sample_timer.setInterval(interval_ms)
+        self._sample_timer.timeout.connect(self._sample)
+        # Resolved sizes trickle in row by row; recompute once per batch
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(interval_ms // 2)
+        self._refresh_timer.timeout.connect(self.updated)
+        self.queue_manager.item_changed.connect(self._schedule_refresh)
+
+    def record_progress(self, item_id: str, progress: dict) -> None:
+        if progress.get('status') != 'downloading':
+            return
+        filename = progress.get('filename', '')
+        downloaded = float(progress.get('downloaded_bytes') or 0)
+        total = float(progress.get('total_bytes') or 0)
+        files = self._files.setdefault(item_id, {})
+        # The first report of a file is the baseline: a resumed download
+        # starts from its partial size, which was not fetched just now
+        if filename in files:
+            previous = files[filename][0]
+            # A restarted file (no resume support) starts again from zero
+            self._bytes += downloaded - previous if downloaded >= previous else downloaded
+        files[filename] = (downloaded, total)
+        if not self._sample_timer.isActive():
+            self._sampled = time.monotonic()
+            self._sample_timer.start()
+
+    def forget(self, item_id: str) -> None:
+        self._files.pop(item_id, None)
+
+    def throughput(self) -> float:
+        return self._rate
+
+    def bytes_remaining(self) -> Tuple[int, int]:
+        # (bytes left on items of known size, number of items of unknown size)
+        remaining = 0.0
+        unknown = 0
+        for item in self.queue_manager.get_queue():
+            if item.status in (DownloadStatus.COMPLETED, DownloadStatus.FAILED):
+                continue
+            files = self._files.get(item.id)
+            if item.playlist:
+                unknown += 1
+            elif files:
+                done = sum(downloaded for downloaded, _ in files.values())
+                seen = sum(total for _, total in files.values())
+                # A merged download reports its formats one file at a time
+                remaining += max(item.filesize - done, seen - done, 0)
+            elif item.filesize:
+                remaining += item.filesize * (1 - item.progress / 100)
+            else:
+                unknown += 1
+        return int(remaining), unknown
+
+    def eta(self) -> Optional[float]:
+        if self._rate <= 0:
+            return None
+        return self.bytes_remaining()[0] / self._rate
+
+    def _sample(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._sampled
+        if elapsed <= 0:
+            return
+        rate = self._bytes / elapsed
+        self._rate = rate if not self._rate else self._smoothing * rate + (1 - self._smoothing) * self._rate
+        self._bytes = 0.0
+        self._sampled = now
+        # Keep the last rate once nothing runs, for the items still waiting
+        if self.queue_manager.active_count() == 0:
+            self._sample_timer.stop()
+        self.updated.emit()
+
+    def _schedule_refresh(self) -> None:
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
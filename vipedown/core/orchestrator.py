@@ -0,0 +1,206 @@
+from typing import Dict, List, Optional, Set
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, Qt
+from loguru import logger
+import asyncio
+import threading
+
+from .downloader import VipeDownloader, DownloadConfig
+from .engine import DownloadEngine
+
+@dataclass
+class _Job:
+    job_id: str
+    config: DownloadConfig
+    scope: str
+    task: Optional[asyncio.Task] = None
+    downloader: Optional[VipeDownloader] = None
+    # What the downloader reported; the job itself is reported by the loop
+    outcome: Optional[tuple] = None
+    cancelled: bool = False
+    pausing: bool = False
+    reported: bool = False
+
+class DownloadOrchestrator(DownloadEngine):
+    # Same signals and methods as DownloadEngine, but every job is an
+    # asyncio task on a private event loop thread; the blocking yt-dlp work
+    # runs on an executor. A job is over as soon as its task is: cancelling,
+    # pausing or timing out reports right away instead of waiting for yt-dlp
+    # to call a progress hook again. The abandoned thread is told to stop,
+    # and a restarted job waits for it so two never write the same file.
+    #
+    # At most max_in_flight downloads hold an executor thread, counting
+    # abandoned ones that are still winding down; the rest wait on the loop
+    # (backpressure). Jobs belong to a named scope that can be
+    # cancelled as a unit.
+
+    def __init__(self, parent: Optional[QObject] = None, max_in_flight: int = 8, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="vipedown-job")
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._running: Set[asyncio.Future] = set()
+        self._draining: Dict[str, asyncio.Future] = {}
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._run_loop, name="vipedown-orchestrator", daemon=True)
+        self._loop_thread.start()
+
+    def start(self, job_id: str, config: DownloadConfig, scope: str = "queue") -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                logger.warning(f"Job already running: {job_id}")
+                return
+            job = _Job(job_id, config, scope)
+            self._jobs[job_id] = job
+        asyncio.run_coroutine_threadsafe(self._run_job(job), self._loop)
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job:
+            job.cancelled = True
+            self._loop.call_soon_threadsafe(self._cancel_task, job)
+
+    def pause(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job:
+            job.pausing = True
+            self.cancel(job_id)
+
+    def pause_all(self) -> None:
+        for job_id in self.active_jobs():
+            self.pause(job_id)
+
+    def cancel_all(self) -> None:
+        for job_id in self.active_jobs():
+            self.cancel(job_id)
+
+    def cancel_scope(self, scope: str) -> None:
+        with self._lock:
+            job_ids = [job.job_id for job in self._jobs.values() if job.scope == scope]
+        for job_id in job_ids:
+            self.cancel(job_id)
+
+    def set_rate_limit(self, job_id: str, limit: int) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job and job.downloader:
+            job.downloader.set_rate_limit(limit)
+
+    def is_running(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def active_jobs(self) -> List[str]:
+        with self._lock:
+            return list(self._jobs)
+
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        self.cancel_all()
+        if self._loop.is_running():
+            drained = asyncio.run_coroutine_threadsafe(self._drain(timeout_ms / 1000), self._loop)
+            try:
+                drained.result(timeout_ms / 1000 + 1)
+            except Exception as e:
+                logger.warning(f"Jobs did not stop in time: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout_ms / 1000)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pool.close()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @staticmethod
+    def _cancel_task(job: _Job) -> None:
+        # A job that has not started yet sees job.cancelled instead
+        if job.task is not None:
+            job.task.cancel()
+
+    async def _run_job(self, job: _Job) -> None:
+        job.task = asyncio.current_task()
+        try:
+            if job.cancelled:
+                raise asyncio.CancelledError()
+            # Let a previous run of the same job (e.g. before a pause) exit first
+            previous = self._draining.get(job.job_id)
+            if previous is not None:
+                await asyncio.wait([previous])
+
+            await self._slots.acquire()
+            try:
+                job.downloader = self._create_downloader(job)
+                run = self._loop.run_in_executor(self._executor, job.downloader.download, job.config)
+            except BaseException:
+                self._slots.release()
+                raise
+            # The slot goes with the thread, not the job: a cancelled job is
+            # reported at once but its download may take a while to stop
+            run.add_done_callback(lambda _: self._slots.release())
+            self._running.add(run)
+            run.add_done_callback(self._running.discard)
+            try:
+                await asyncio.wait_for(asyncio.shield(run), job.config.timeout or None)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                job.downloader.cancel()
+                self._draining[job.job_id] = run
+                run.add_done_callback(lambda _: self._drained(job.job_id, run))
+                raise
+        except asyncio.TimeoutError:
+            self._report(job, False, f"Timed out after {job.config.timeout:g}s")
+        except asyncio.CancelledError:
+            self._report(job, False, "Download cancelled")
+        except Exception as e:
+            logger.exception("Download job failed")
+            self._report(job, False, f"Download failed: {e}")
+        else:
+            self._report(job, *(job.outcome or (False, "No downloadable media found")))
+
+    def _create_downloader(self, job: _Job) -> VipeDownloader:
+        downloader = VipeDownloader(
+            self._cache, self._progress_rate, self._pool, self.governor,
+            self._tuner, self._archive, self.dedup
+        )
+        # Emitted on the executor thread; Qt queues them to the receivers
+        direct = Qt.ConnectionType.DirectConnection
+        job_id = job.job_id
+        downloader.progress.connect(lambda progress: self._forward(job, self.progress, job_id, progress), direct)
+        downloader.info.connect(lambda info: self._forward(job, self.info, job_id, info), direct)
+        downloader.playlist_progress.connect(
+            lambda progress: self._forward(job, self.playlist_progress, job_id, progress), direct
+        )
+        downloader.error.connect(lambda message: self._forward(job, self.error, job_id, message), direct)
+        downloader.completed.connect(lambda success, message: setattr(job, 'outcome', (success, message)), direct)
+        return downloader
+
+    @staticmethod
+    def _forward(job: _Job, signal, *args) -> None:
+        if not job.reported and not job.cancelled:
+            signal.emit(*args)
+
+    def _report(self, job: _Job, success: bool, message: str) -> None:
+        with self._lock:
+            if job.reported:
+                return
+            job.reported = True
+            self._jobs.pop(job.job_id, None)
+        if job.pausing and not success:
+            self.paused.emit(job.job_id)
+        else:
+            self.completed.emit(job.job_id, success, message)
+
+    def _drained(self, job_id: str, run: asyncio.Future) -> None:
+        if self._draining.get(job_id) is run:
+            del self._draining[job_id]
+
+    async def _drain(self, timeout: float) -> None:
+        if self._running:
+            await asyncio.wait(set(self._running), timeout=timeout)
@@ -0,0 +1,143 @@
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import json
+import os
+import uuid
+from loguru import logger
+
+from ..utils.files import atomic_write_text
+
+class QueueStore:
+    # Queue state is a snapshot (queue.json) plus an append-only journal of
+    # changes made since that snapshot (queue.journal, one JSON op per line).
+    # Replaying the journal is idempotent, so a crash between writing a new
+    # snapshot and truncating the journal loses nothing.
+
+    def __init__(self, directory: Optional[Path] = None, compact_threshold: int = 1000):
+        directory = directory or Path.home() / ".config" / "vipedown"
+        self._snapshot_file = directory / "queue.json"
+        self._journal_file = directory / "queue.journal"
+        self._compact_threshold = compact_threshold
+        self._journal_ops = 0
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._pending_order: Optional[List[str]] = None
+        self._pending_clear = False
+
+    def record_put(self, item: Dict[str, Any]) -> None:
+        self._pending[item['id']] = item
+
+    def record_remove(self, item_id: str) -> None:
+        self._pending[item_id] = None
+
+    def record_order(self, item_ids: List[str]) -> None:
+        self._pending_order = item_ids
+
+    def record_clear(self) -> None:
+        self._pending.clear()
+        self._pending_order = None
+        self._pending_clear = True
+
+    def pending_count(self) -> int:
+        return len(self._pending) + (self._pending_order is not None) + self._pending_clear
+
+    def has_pending(self) -> bool:
+        return bool(self._pending or self._pending_order is not None or self._pending_clear)
+
+    def flush(self) -> None:
+        if not self.has_pending():
+            return
+
+        ops = []
+        if self._pending_clear:
+            ops.append({'op': 'clear'})
+        for item_id, item in self._pending.items():
+            if item is None:
+                ops.append({'op': 'remove', 'id': item_id})
+            else:
+                ops.append({'op': 'put', 'item': item})
+        if self._pending_order is not None:
+            ops.append({'op': 'order', 'ids': self._pending_order})
+
+        try:
+            self._journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._journal_file, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(op) + '\n' for op in ops))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Failed to write queue journal: {e}")
+            return
+
+        self._journal_ops += len(ops)
+        self._pending.clear()
+        self._pending_order = None
+        self._pending_clear = False
+
+    def needs_compaction(self, extra_ops: int = 0) -> bool:
+        return self._journal_ops + extra_ops >= self._compact_threshold
+
+    def compact(self, items: List[Dict[str, Any]]) -> None:
+        try:
+            self._snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._snapshot_file, json.dumps(items))
+            with open(self._journal_file, 'w', encoding='utf-8') as f:
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logger.error(f"Failed to compact queue: {e}")
+            return
+
+        self._journal_ops = 0
+        self._pending.clear()
+        self._pending_order = None
+        self._pending_clear = False
+
+    def load(self) -> List[Dict[str, Any]]:
+        items: Dict[str, Dict[str, Any]] = {}
+        try:
+            if self._snapshot_file.exists():
+                for item in json.loads(self._snapshot_file.read_text(encoding='utf-8')):
+                    # Queues saved before ids were mandatory may carry None
+                    item['id'] = item.get('id') or uuid.uuid4().hex
+                    items[item['id']] = item
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Failed to load queue snapshot: {e}")
+
+        self._journal_ops = 0
+        try:
+            if self._journal_file.exists():
+                valid_end = 0
+                with open(self._journal_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            op = json.loads(line)
+                        except ValueError:
+                            # A torn final line from a crash mid-append
+                            logger.warning("Discarding corrupt queue journal tail")
+                            break
+                        items = self._apply(items, op)
+                        self._journal_ops += 1
+                        valid_end += len(line)
+                # Cut the torn tail off so the next append starts on a clean line
+                if valid_end < self._journal_file.stat().st_size:
+                    os.truncate(self._journal_file, valid_end)
+        except OSError as e:
+            logger.error(f"Failed to read queue journal: {e}")
+
+        return list(items.values())
+
+    @staticmethod
+    def _apply(items: Dict[str, Dict[str, Any]], op: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        kind = op.get('op')
+        if kind == 'put':
+            items[op['item']['id']] = op['item']
+        elif kind == 'remove':
+            items.pop(op['id'], None)
+        elif kind == 'clear':
+            items.clear()
+        elif kind == 'order':
+            ordered = {item_id: items[item_id] for item_id in op['ids'] if item_id in items}
+            for item_id, item in items.items():
+                ordered.setdefault(item_id, item)
+            items = ordered
+        return items
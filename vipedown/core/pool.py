@@ -0,0 +1,95 @@
+from typing import Any, Callable, Dict, List
+import json
+import threading
+import yt_dlp
+from loguru import logger
+
+# Options that change from item to item. YoutubeDL reads these per call (or
+# derives them cheaply), so they are swapped on a pooled instance instead of
+# being part of its identity.
+PER_ITEM_OPTIONS = (
+    'format', 'outtmpl', 'playlist_items', 'playliststart', 'playlistend',
+    'concurrent_fragment_downloads', 'http_chunk_size', 'logger'
+)
+
+class YoutubeDLPool:
+    # Idle YoutubeDL instances keyed by the fingerprint of their construction
+    # options. Building one loads every extractor, a cookie jar and a fresh
+    # HTTP session; reusing it keeps connections to the same site warm.
+    # An instance is only ever used by the thread that acquired it.
+
+    def __init__(self, max_idle: int = 4):
+        self._max_idle = max_idle
+        self._idle: Dict[str, List[yt_dlp.YoutubeDL]] = {}
+        self._keys: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def fingerprint(options: Dict[str, Any]) -> str:
+        shared = {
+            key: value for key, value in options.items()
+            if key not in PER_ITEM_OPTIONS and not callable(value)
+            and key != 'progress_hooks'
+        }
+        return json.dumps(shared, sort_keys=True, default=repr)
+
+    def acquire(self, options: Dict[str, Any]) -> yt_dlp.YoutubeDL:
+        key = self.fingerprint(options)
+        with self._lock:
+            idle = self._idle.get(key)
+            ydl = idle.pop() if idle else None
+
+        if ydl is None:
+            # yt-dlp keeps (and mutates) the params dict it is given
+            ydl = yt_dlp.YoutubeDL(dict(options))
+            logger.debug(f"Created YoutubeDL instance for pool key {hash(key):x}")
+        else:
+            self._apply_item_options(ydl, options)
+
+        with self._lock:
+            self._keys[id(ydl)] = key
+        return ydl
+
+    def release(self, ydl: yt_dlp.YoutubeDL) -> None:
+        with self._lock:
+            key = self._keys.pop(id(ydl), None)
+            if key is not None and not self._closed:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self._max_idle:
+                    idle.append(ydl)
+                    return
+        self._close(ydl)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            instances = [ydl for idle in self._idle.values() for ydl in idle]
+            self._idle.clear()
+        for ydl in instances:
+            self._close(ydl)
+
+    @staticmethod
+    def _apply_item_options(ydl: yt_dlp.YoutubeDL, options: Dict[str, Any]) -> None:
+        for key in PER_ITEM_OPTIONS:
+            if key in options:
+                ydl.params[key] = options[key]
+            else:
+                ydl.params.pop(key, None)
+
+        # Both of these are derived from params when the instance is built
+        ydl._parse_outtmpl()
+        ydl.format_selector = (
+            ydl.build_format_selector(options['format']) if options.get('format') else None
+        )
+
+        hooks: List[Callable] = options.get('progress_hooks') or []
+        ydl._progress_hooks = list(hooks)
+        ydl._download_retcode = 0
+
+    @staticmethod
+    def _close(ydl: yt_dlp.YoutubeDL) -> None:
+        try:
+            ydl.close()
+        except Exception as e:
+            logger.warning(f"Failed to close YoutubeDL instance: {e}")
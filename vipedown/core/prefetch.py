@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+from loguru import logger
+import heapq
+import itertools
+import threading
+
+from .downloader import DownloadConfig
+
+# Request priorities: items about to start come before filling in the rest
+# of the queue
+URGENT, BACKGROUND = 0, 1
+
+def summarize(info: Dict[str, Any]) -> Dict[str, Any]:
+    # The few fields the queue shows; a merged download sums its formats
+    formats = info.get('requested_formats') or [info]
+    sizes = [f.get('filesize') or f.get('filesize_approx') or 0 for f in formats]
+    return {
+        'title': info.get('title', ''),
+        'duration': info.get('duration') or 0,
+        'filesize': int(sum(sizes)) if all(sizes) else 0,
+        'thumbnail': info.get('thumbnail', '')
+    }
+
+class MetadataPrefetcher(QObject):
+    # Extraction stage of the queue pipeline: resolves items ahead of their
+    # turn on a few background threads, through engine.prefetch(), which
+    # stores the info in the metadata cache. When the item starts, the
+    # download stage finds it there instead of extracting again.
+    #
+    # The same stage fills in titles, durations and sizes for the rest of
+    # the queue at BACKGROUND priority. Those results are cached too, so an
+    # item resolved in the background is not extracted again when it comes
+    # up, as long as the cache entry is still fresh by then. A handful of
+    # threads take the most urgent request first; an item that comes up
+    # next is requested again as URGENT, which is a cache hit if it was
+    # resolved already and waits for the extraction if it is still running.
+    prefetched = pyqtSignal(str, dict)
+
+    def __init__(self, engine, workers: int = 2, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._engine = engine
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="vipedown-prefetch")
+        # item id -> most urgent priority requested so far
+        self._requested: Dict[str, int] = {}
+        # (priority, order, item id, config); superseded entries are skipped
+        self._heap: List[tuple] = []
+        self._queued: Dict[str, int] = {}
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def request(self, item_id: str, config: DownloadConfig, priority: int = URGENT) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            if self._requested.get(item_id, BACKGROUND + 1) <= priority:
+                return False
+            self._requested[item_id] = priority
+            self._queued[item_id] = priority
+            heapq.heappush(self._heap, (priority, next(self._order), item_id, config))
+        # One task per entry; each resolves whichever entry is most urgent
+        self._executor.submit(self._resolve_next)
+        return True
+
+    def is_requested(self, item_id: str) -> bool:
+        with self._lock:
+            return item_id in self._requested
+
+    def forget(self, item_id: str) -> None:
+        with self._lock:
+            self._requested.pop(item_id, None)
+            self._queued.pop(item_id, None)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _resolve_next(self) -> None:
+        with self._lock:
+            while self._heap and not self._closed:
+                priority, _, item_id, config = heapq.heappop(self._heap)
+                if self._queued.get(item_id) == priority:
+                    del self._queued[item_id]
+                    break
+            else:
+                return
+        try:
+            info = self._engine.prefetch(config, summary=priority == BACKGROUND)
+        except Exception as e:
+            logger.warning(f"Prefetch failed for {config.url}: {e}")
+            return
+        if info and info.get('_type', 'video') == 'video':
+            self.prefetched.emit(item_id, summarize(info))
@@ -0,0 +1,402 @@
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from PyQt6.QtCore import QObject, Qt
+from loguru import logger
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+
+from .downloader import VipeDownloader, DownloadConfig
+from .engine import DownloadEngine
+from .bandwidth import BandwidthGovernor
+from .archive import file_sha256
+
+# What a worker process may call on the objects shared through the parent
+REMOTE_METHODS = {
+    'cache': {'get', 'claim', 'release', 'put', 'invalidate'},
+    'archive': {'__contains__', '__len__', 'add', 'record', 'get'},
+    'dedup': {'deduplicate', 'materialize'},
+    'tuner': {'options_for', 'record_sample', 'record_throttled'},
+}
+
+class _Channel:
+    # Child end of the pipe. Events go straight out; calls into the parent
+    # wait for their reply, which the control thread hands over by call id.
+
+    def __init__(self, conn: Connection, call_timeout: float = 60.0):
+        self._conn = conn
+        self._call_timeout = call_timeout
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pending: Dict[int, queue.Queue] = {}
+
+    def send(self, message: tuple) -> None:
+        with self._send_lock:
+            self._conn.send(message)
+
+    def call(self, target: str, method: str, *args) -> Any:
+        call_id = next(self._ids)
+        reply: queue.Queue = queue.Queue(maxsize=1)
+        self._pending[call_id] = reply
+        try:
+            self.send(('call', call_id, target, method, args))
+            ok, result = reply.get(timeout=self._call_timeout)
+        finally:
+            self._pending.pop(call_id, None)
+        if not ok:
+            raise RuntimeError(f"{target}.{method} failed in the parent process: {result}")
+        return result
+
+    def serve(self, downloader: VipeDownloader) -> None:
+        thread = threading.Thread(target=self._read, args=(downloader,), name="vipedown-control", daemon=True)
+        thread.start()
+
+    def _read(self, downloader: VipeDownloader) -> None:
+        while True:
+            try:
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                # The parent is gone; nobody is left to report to
+                downloader.cancel()
+                return
+            if message[0] == 'reply':
+                _, call_id, ok, result = message
+                reply = self._pending.get(call_id)
+                if reply is not None:
+                    reply.put((ok, result))
+            elif message[0] == 'cancel':
+                downloader.cancel()
+            elif message[0] == 'rate':
+                downloader.set_rate_limit(message[1])
+
+class _Remote:
+    def __init__(self, channel: _Channel, target: str):
+        self._channel = channel
+        self._target = target
+
+    def _call(self, method: str, *args) -> Any:
+        return self._channel.call(self._target, method, *args)
+
+class _RemoteCache(_Remote):
+    def get(self, url: str, variant: str = ""):
+        return self._call('get', url, variant)
+
+    def claim(self, url: str, variant: str = ""):
+        return self._call('claim', url, variant)
+
+    def release(self, url: str, variant: str = "") -> None:
+        self._call('release', url, variant)
+
+    def put(self, url: str, variant: str, info: Dict[str, Any]) -> None:
+        self._call('put', url, variant, info)
+
+    def invalidate(self, url: str, variant: str = "") -> None:
+        self._call('invalidate', url, variant)
+
+class _RemoteArchive(_Remote):
+    def __contains__(self, archive_id: str) -> bool:
+        return self._call('__contains__', archive_id)
+
+    def __len__(self) -> int:
+        return self._call('__len__')
+
+    def __repr__(self) -> str:
+        return "DownloadArchive(remote)"
+
+    def add(self, archive_id: str) -> None:
+        self._call('add', archive_id)
+
+    def record(self, archive_id: str, path: str) -> None:
+        # Hash here, not in the parent, which serves every worker
+        try:
+            checksum = file_sha256(Path(path))
+        except OSError as e:
+            logger.warning(f"Not archiving {archive_id}, file unreadable: {e}")
+            return
+        self._call('record', archive_id, path, checksum)
+
+    def get(self, archive_id: str):
+        return self._call('get', archive_id)
+
+class _RemoteDedup(_Remote):
+    def deduplicate(self, archive_id: str) -> int:
+        return self._call('deduplicate', archive_id)
+
+    def materialize(self, archive_id: str, target: Path) -> bool:
+        return self._call('materialize', archive_id, target)
+
+class _RemoteTuner(_Remote):
+    def options_for(self, url: str) -> Dict[str, Any]:
+        return self._call('options_for', url)
+
+    def record_sample(self, url: str, size: float, elapsed: float, fragmented: bool) -> None:
+        self._call('record_sample', url, size, elapsed, fragmented)
+
+    def record_throttled(self, url: str, status: int) -> None:
+        self._call('record_throttled', url, status)
+
+def _run_worker(conn: Connection, config: DownloadConfig, progress_rate: float, shared: Dict[str, bool]):
+    # Entry point of a worker process
+    channel = _Channel(conn)
+    downloader = VipeDownloader(
+        _RemoteCache(channel, 'cache') if shared['cache'] else None,
+        progress_rate,
+        # The parent splits the bandwidth budget and sends this job its share
+        governor=BandwidthGovernor(),
+        tuner=_RemoteTuner(channel, 'tuner') if shared['tuner'] else None,
+        archive=_RemoteArchive(channel, 'archive') if shared['archive'] else None,
+        dedup=_RemoteDedup(channel, 'dedup') if shared['dedup'] else None
+    )
+    # No event loop runs here, so a queued call from yt-dlp's fragment threads
+    # or the playlist entry threads would never be delivered; send() is locked
+    direct = Qt.ConnectionType.DirectConnection
+    for name in ('progress', 'info', 'playlist_progress', 'error', 'completed'):
+        getattr(downloader, name).connect(lambda *args, name=name: channel.send((name, *args)), direct)
+    channel.serve(downloader)
+    downloader.download(config)
+
+@dataclass
+class _Job:
+    job_id: str
+    config: DownloadConfig
+    process: Any
+    conn: Connection
+    started: float = field(default_factory=time.monotonic)
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    outcome: Optional[tuple] = None
+    rate: float = 0.0
+    cancelled: bool = False
+    pausing: bool = False
+    timed_out: bool = False
+    kill_at: float = 0.0
+    closed: bool = False
+
+class ProcessDownloadEngine(DownloadEngine):
+    # Same signals and methods as DownloadEngine, but every download runs in
+    # its own worker process (spawned, not forked, since Qt and yt-dlp's
+    # threads don't survive a fork). Extraction no longer shares the GIL,
+    # and a crash or a hung extractor takes down one job only: a worker
+    # that ignores a cancel is killed after kill_grace seconds.
+    #
+    # Events stream back over a pipe and are re-emitted here. The metadata
+    # cache, archive, deduplicator and tuner stay in this process and are
+    # called over the same pipe, so there is still one writer for each.
+    # The bandwidth budget is split here and each worker paces itself to
+    # its share. Those calls run on their own threads so that a slow one
+    # (hashing a large file for dedup) doesn't hold up every job's events.
+
+    def __init__(self, parent: Optional[QObject] = None, kill_grace: float = 10.0,
+                 call_workers: int = 4, **kwargs):
+        super().__init__(parent, **kwargs)
+        self._context = multiprocessing.get_context('spawn')
+        self._kill_grace = kill_grace
+        self._calls = ThreadPoolExecutor(max_workers=max(1, call_workers), thread_name_prefix="vipedown-remote")
+        self._jobs: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._targets = {'cache': self._cache, 'archive': self._archive, 'dedup': self.dedup, 'tuner': self._tuner}
+        self._stopping = False
+        self._pump = threading.Thread(target=self._pump_events, name="vipedown-process-pump", daemon=True)
+        self._pump.start()
+
+    def start(self, job_id: str, config: DownloadConfig) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                logger.warning(f"Job already running: {job_id}")
+                return
+
+        self.governor.register(job_id, config.rate_limit)
+        rate = self.governor.rate_of(job_id)
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_run_worker,
+            args=(child_conn, replace(config, rate_limit=int(rate)), self._progress_rate,
+                  {name: target is not None for name, target in self._targets.items()}),
+            name=f"vipedown-job-{job_id[:8]}",
+            daemon=True
+        )
+        try:
+            process.start()
+        except Exception as e:
+            logger.exception("Failed to start worker process")
+            self.governor.unregister(job_id)
+            self.completed.emit(job_id, False, f"Download failed: {e}")
+            return
+        finally:
+            child_conn.close()
+
+        with self._lock:
+            self._jobs[job_id] = _Job(job_id, config, process, parent_conn, rate=rate)
+        self._push_rates()
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job and not job.cancelled:
+            job.cancelled = True
+            job.kill_at = time.monotonic() + self._kill_grace
+            self._send(job, ('cancel',))
+
+    def pause(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job:
+            job.pausing = True
+            self.cancel(job_id)
+
+    def pause_all(self) -> None:
+        for job_id in self.active_jobs():
+            self.pause(job_id)
+
+    def cancel_all(self) -> None:
+        for job_id in self.active_jobs():
+            self.cancel(job_id)
+
+    def set_rate_limit(self, job_id: str, limit: int) -> None:
+        self.governor.set_item_limit(job_id, limit)
+        self._push_rates()
+
+    def is_running(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def active_jobs(self) -> List[str]:
+        with self._lock:
+            return list(self._jobs)
+
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def shutdown(self, timeout_ms: int = 3000) -> None:
+        self.cancel_all()
+        deadline = time.monotonic() + timeout_ms / 1000
+        while self.active_count() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        with self._lock:
+            leftover = list(self._jobs.values())
+        for job in leftover:
+            logger.warning(f"Worker process did not stop in time: {job.job_id}")
+            job.process.kill()
+        self._stopping = True
+        self._pump.join(1.0)
+        self._calls.shutdown(wait=False, cancel_futures=True)
+        self._pool.close()
+
+    def _send(self, job: _Job, message: tuple) -> None:
+        with job.send_lock:
+            if job.closed:
+                return
+            try:
+                job.conn.send(message)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Worker pipe for {job.job_id} is closed: {e}")
+
+    def _push_rates(self) -> None:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            rate = self.governor.rate_of(job.job_id)
+            if rate != job.rate:
+                job.rate = rate
+                self._send(job, ('rate', int(rate)))
+
+    def _pump_events(self) -> None:
+        while not self._stopping:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            if not jobs:
+                time.sleep(0.1)
+                continue
+
+            by_handle = {}
+            for job in jobs:
+                if not job.closed:
+                    by_handle[job.conn] = job
+                by_handle[job.process.sentinel] = job
+            for handle in wait(list(by_handle), timeout=0.25):
+                job = by_handle[handle]
+                if handle is job.conn:
+                    self._receive(job)
+
+            now = time.monotonic()
+            for job in jobs:
+                if job.config.timeout and not job.cancelled and now - job.started > job.config.timeout:
+                    job.timed_out = True
+                    self.cancel(job.job_id)
+                if job.cancelled and now > job.kill_at and job.process.is_alive():
+                    logger.warning(f"Killing unresponsive worker process for {job.job_id}")
+                    job.process.kill()
+                if not job.process.is_alive():
+                    self._receive(job)
+                    self._finish(job)
+
+            self.governor.refresh()
+            self._push_rates()
+
+    def _receive(self, job: _Job) -> None:
+        try:
+            while not job.closed and job.conn.poll():
+                self._dispatch(job, job.conn.recv())
+        except (EOFError, OSError):
+            with job.send_lock:
+                job.closed = True
+
+    def _dispatch(self, job: _Job, message: tuple) -> None:
+        kind = message[0]
+        if kind == 'call':
+            try:
+                self._calls.submit(self._serve_call, job, *message[1:])
+            except RuntimeError:
+                # Shutting down; the worker is about to be stopped anyway
+                pass
+        elif kind == 'completed':
+            job.outcome = message[1:]
+        elif job.cancelled and kind == 'error':
+            return
+        elif kind == 'progress':
+            self.progress.emit(job.job_id, message[1])
+        elif kind == 'info':
+            self.info.emit(job.job_id, message[1])
+        elif kind == 'playlist_progress':
+            self.playlist_progress.emit(job.job_id, message[1])
+        elif kind == 'error':
+            self.error.emit(job.job_id, message[1])
+
+    def _serve_call(self, job: _Job, call_id: int, target: str, method: str, args: tuple) -> None:
+        try:
+            if method not in REMOTE_METHODS.get(target, ()):
+                raise ValueError(f"{target}.{method} is not callable remotely")
+            result = (True, getattr(self._targets[target], method)(*args))
+        except Exception as e:
+            logger.error(f"Remote call {target}.{method} failed: {e}")
+            result = (False, str(e))
+        self._send(job, ('reply', call_id, *result))
+
+    def _finish(self, job: _Job) -> None:
+        with self._lock:
+            if self._jobs.pop(job.job_id, None) is None:
+                return
+        with job.send_lock:
+            job.closed = True
+            job.conn.close()
+        job.process.join(0)
+        self.governor.unregister(job.job_id)
+
+        success, message = job.outcome or (False, "")
+        if job.timed_out:
+            self.completed.emit(job.job_id, False, f"Timed out after {job.config.timeout:g}s")
+        elif job.pausing and not success:
+            self.paused.emit(job.job_id)
+        elif job.outcome:
+            self.completed.emit(job.job_id, success, message)
+        elif job.cancelled:
+            self.completed.emit(job.job_id, False, "Download cancelled")
+        elif job.process.exitcode:
+            self.completed.emit(job.job_id, False, f"Worker process exited with code {job.process.exitcode}")
+        else:
+            self.completed.emit(job.job_id, False, "No downloadable media found")
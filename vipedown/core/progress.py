@@ -0,0 +1,30 @@
+from typing import Dict
+import threading
+import time
+
+class ProgressThrottle:
+    def __init__(self, rate: float = 10.0):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._last_emit: Dict[str, float] = {}
+        self._last_state: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, state: str) -> bool:
+        # State changes always pass; repeats of the same state are limited
+        # to one per interval and the intermediate ones are dropped, since
+        # every hook call carries the cumulative totals anyway.
+        now = time.monotonic()
+        with self._lock:
+            if self._last_state.get(key) != state:
+                self._last_state[key] = state
+                self._last_emit[key] = now
+                return True
+            if now - self._last_emit.get(key, 0.0) >= self._interval:
+                self._last_emit[key] = now
+                return True
+            return False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._last_emit.clear()
+            self._last_state.clear()
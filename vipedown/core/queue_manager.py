@@ -1,10 +1,14 @@
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set
 from enum import Enum
-from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from pathlib import Path
-import json
-from loguru import logger
+import glob
+import uuid
+
+from .cache import MetadataCache
+from .persistence import QueueStore
+from ..utils.urls import canonical_url
 
 class DownloadStatus(Enum):
     PENDING = "pending"
@@ -26,82 +30,244 @@ class QueueItem:
     error: str = ""
     title: str = ""
     id: Optional[str] = None
+    filename: str = ""
+    rate_limit: int = 0
+    # Resolved in the background before the download starts (0/"" if unknown)
+    duration: float = 0
+    filesize: int = 0
+    thumbnail: str = ""
 
 class QueueManager(QObject):
+    # queue_updated: rows were added, removed or reordered
+    # item_changed: only the item at the given row changed
+    # items_added: ids of items that were just added or restored
     queue_updated = pyqtSignal()
+    item_changed = pyqtSignal(int)
+    items_added = pyqtSignal(list)
     status_changed = pyqtSignal(str, DownloadStatus)
     
-    def __init__(self):
+    def __init__(self, max_concurrent: int = 3, cache: Optional[MetadataCache] = None,
+                 store: Optional[QueueStore] = None, save_delay_ms: int = 500):
         super().__init__()
+        self._cache = cache
         self._queue: List[QueueItem] = []
-        self._current_index: int = -1
+        self._items_by_id: Dict[str, QueueItem] = {}
+        self._positions: Dict[str, int] = {}
+        self._active_ids: Set[str] = set()
+        self._max_concurrent: int = max(1, max_concurrent)
         self._active: bool = False
         self._paused: bool = False
-        self._queue_file = Path.home() / ".config" / "vipedown" / "queue.json"
-        self.clear_queue()
+        self._store = store or QueueStore()
+        # Changes are journaled in batches; the timer is not restarted by
+        # later changes so a busy queue still flushes every save_delay_ms
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(save_delay_ms)
+        self._save_timer.timeout.connect(self.flush)
+        self._restored = False
 
     def add_item(self, item: QueueItem) -> None:
+        if not item.id or item.id in self._items_by_id:
+            item.id = uuid.uuid4().hex
+        if not item.title and self._cache:
+            item.title = self._cache.get_title(item.url)
+        self._items_by_id[item.id] = item
+        self._positions[item.id] = len(self._queue)
         self._queue.append(item)
-        self._save_queue()
+        self._save_item(item)
         self.queue_updated.emit()
+        self.items_added.emit([item.id])
+
+    def add_items(self, items: List[QueueItem], skip_duplicates: bool = True) -> List[QueueItem]:
+        # Bulk insert: one journal write and one model reset for the whole batch
+        # Finished and failed items may be queued again
+        queued = {
+            self._dedupe_key(item) for item in self._queue
+            if item.status in (DownloadStatus.PENDING, DownloadStatus.DOWNLOADING, DownloadStatus.PAUSED)
+        } if skip_duplicates else set()
+        titles = self._cache.get_titles([item.url for item in items]) if self._cache else {}
+        added = []
+        for item in items:
+            key = self._dedupe_key(item)
+            if key in queued:
+                continue
+            queued.add(key)
+            if not item.id or item.id in self._items_by_id:
+                item.id = uuid.uuid4().hex
+            if not item.title:
+                item.title = titles.get(item.url, "")
+            self._items_by_id[item.id] = item
+            self._positions[item.id] = len(self._queue)
+            self._queue.append(item)
+            self._store.record_put(self._serialize_item(item))
+            added.append(item)
+
+        if added:
+            self._schedule_save()
+            self.queue_updated.emit()
+            self.items_added.emit([item.id for item in added])
+        return added
 
     def remove_item(self, index: int) -> None:
         if 0 <= index < len(self._queue):
-            if index == self._current_index and self._active:
+            if self._queue[index].id in self._active_ids:
                 return
-            del self._queue[index]
-            if index < self._current_index:
-                self._current_index -= 1
-            self._save_queue()
+            item = self._queue.pop(index)
+            del self._items_by_id[item.id]
+            del self._positions[item.id]
+            self._reindex(index, len(self._queue))
+            self._store.record_remove(item.id)
+            self._schedule_save()
             self.queue_updated.emit()
 
     def clear_queue(self) -> None:
         if not self._active:
             self._queue.clear()
-            self._current_index = -1
-            self._save_queue()
+            self._items_by_id.clear()
+            self._positions.clear()
+            self._active_ids.clear()
+            # Nothing worth journaling survives a clear; write the empty
+            # snapshot straight away
+            self._store.record_clear()
+            self._store.compact([])
             self.queue_updated.emit()
 
     def move_item(self, from_index: int, to_index: int) -> None:
         if (0 <= from_index < len(self._queue) and 
             0 <= to_index < len(self._queue) and 
-            from_index != self._current_index):
+            self._queue[from_index].id not in self._active_ids):
             item = self._queue.pop(from_index)
             self._queue.insert(to_index, item)
-            self._save_queue()
+            self._reindex(min(from_index, to_index), max(from_index, to_index) + 1)
+            self._store.record_order([queued.id for queued in self._queue])
+            self._schedule_save()
             self.queue_updated.emit()
 
     def get_next_item(self) -> Optional[QueueItem]:
-        if self._paused or not self._queue:
+        if self._paused or not self.has_free_slot():
             return None
-            
-        next_index = self._current_index + 1
-        if next_index < len(self._queue):
-            self._current_index = next_index
-            item = self._queue[next_index]
-            item.status = DownloadStatus.DOWNLOADING
-            self.status_changed.emit(item.url, DownloadStatus.DOWNLOADING)
-            self._save_queue()
-            self.queue_updated.emit()
-            return item
+
+        for row, item in enumerate(self._queue):
+            if item.status == DownloadStatus.PENDING:
+                item.status = DownloadStatus.DOWNLOADING
+                self._active_ids.add(item.id)
+                self._save_item(item)
+                self.item_changed.emit(row)
+                self.status_changed.emit(item.id, DownloadStatus.DOWNLOADING)
+                return item
         return None
 
-    def update_progress(self, url: str, progress: float) -> None:
+    def get_pending(self, limit: int) -> List[QueueItem]:
+        # The next items get_next_item() would hand out, in order
+        pending = []
         for item in self._queue:
-            if item.url == url:
-                item.progress = progress
-                self.queue_updated.emit()
+            if len(pending) >= limit:
                 break
+            if item.status == DownloadStatus.PENDING:
+                pending.append(item)
+        return pending
 
-    def update_status(self, url: str, status: DownloadStatus, error: str = "") -> None:
-        for item in self._queue:
-            if item.url == url:
-                item.status = status
-                item.error = error
-                self.status_changed.emit(url, status)
-                self._save_queue()
-                self.queue_updated.emit()
-                break
+    def finish_item(self, item_id: str, success: bool, error: str = "") -> Optional[QueueItem]:
+        self._active_ids.discard(item_id)
+        item = self._items_by_id.get(item_id)
+        if item is None:
+            return None
+        if success:
+            item.progress = 100
+            self.update_status(item_id, DownloadStatus.COMPLETED)
+        else:
+            self.update_status(item_id, DownloadStatus.FAILED, error)
+        return item
+
+    def get_item(self, item_id: str) -> Optional[QueueItem]:
+        return self._items_by_id.get(item_id)
+
+    def get_position(self, item_id: str) -> int:
+        return self._positions.get(item_id, -1)
+
+    def has_free_slot(self) -> bool:
+        return len(self._active_ids) < self._max_concurrent
+
+    def get_active_items(self) -> List[QueueItem]:
+        return [item for item in self._queue if item.id in self._active_ids]
+
+    def active_count(self) -> int:
+        return len(self._active_ids)
+
+    def set_max_concurrent(self, max_concurrent: int) -> None:
+        self._max_concurrent = max(1, max_concurrent)
+
+    def get_max_concurrent(self) -> int:
+        return self._max_concurrent
+
+    def update_progress(self, item_id: str, progress: float) -> None:
+        item = self._items_by_id.get(item_id)
+        if item is None:
+            return
+        changed = int(item.progress) != int(progress)
+        item.progress = progress
+        # Rows only display whole percents
+        if changed:
+            self._save_item(item)
+            self.item_changed.emit(self._positions[item_id])
+
+    def set_metadata(self, item_id: str, metadata: Dict) -> None:
+        item = self._items_by_id.get(item_id)
+        if item is None:
+            return
+        changed = False
+        for field in ('title', 'duration', 'filesize', 'thumbnail'):
+            value = metadata.get(field)
+            if value and getattr(item, field) != value:
+                setattr(item, field, value)
+                changed = True
+        if changed:
+            self._save_item(item)
+            self.item_changed.emit(self._positions[item_id])
+
+    def update_filename(self, item_id: str, filename: str) -> None:
+        item = self._items_by_id.get(item_id)
+        if item is not None and filename and item.filename != filename:
+            item.filename = filename
+            self._save_item(item)
+
+    def set_rate_limit(self, item_id: str, limit: int) -> None:
+        item = self._items_by_id.get(item_id)
+        if item is not None and item.rate_limit != limit:
+            item.rate_limit = limit
+            self._save_item(item)
+            self.item_changed.emit(self._positions[item_id])
+
+    def update_status(self, item_id: str, status: DownloadStatus, error: str = "") -> None:
+        item = self._items_by_id.get(item_id)
+        if item is None:
+            return
+        item.status = status
+        item.error = error
+        self._save_item(item)
+        self.item_changed.emit(self._positions[item_id])
+        self.status_changed.emit(item_id, status)
+
+    def pause_item(self, item_id: str) -> bool:
+        item = self._items_by_id.get(item_id)
+        if item is None or item.status not in (DownloadStatus.PENDING, DownloadStatus.DOWNLOADING):
+            return False
+        self._active_ids.discard(item_id)
+        self.update_status(item_id, DownloadStatus.PAUSED)
+        return True
+
+    def resume_item(self, item_id: str) -> bool:
+        item = self._items_by_id.get(item_id)
+        if item is None or item.status != DownloadStatus.PAUSED:
+            return False
+        self.update_status(item_id, DownloadStatus.PENDING)
+        return True
+
+    def resume_paused(self) -> int:
+        paused = [item.id for item in self._queue if item.status == DownloadStatus.PAUSED]
+        for item_id in paused:
+            self.update_status(item_id, DownloadStatus.PENDING)
+        return len(paused)
 
     def pause_queue(self) -> None:
         self._paused = True
@@ -120,7 +286,7 @@ class QueueManager(QObject):
     def set_active(self, active: bool) -> None:
         self._active = active
         if not active:
-            self._current_index = -1
+            self._active_ids.clear()
         self.queue_updated.emit()
 
     def get_queue(self) -> List[QueueItem]:
@@ -132,49 +298,115 @@ class QueueManager(QObject):
             status_count[item.status] += 1
         return status_count
 
-    def _save_queue(self) -> None:
-        try:
-            self._queue_file.parent.mkdir(parents=True, exist_ok=True)
-            queue_data = [
-                {
-                    'url': item.url,
-                    'format_type': item.format_type,
-                    'quality': item.quality,
-                    'playlist': item.playlist,
-                    'playlist_items': item.playlist_items,
-                    'audio_only': item.audio_only,
-                    'status': item.status.value,
-                    'progress': item.progress,
-                    'error': item.error,
-                    'title': item.title,
-                    'id': item.id
-                }
-                for item in self._queue
-            ]
-            self._queue_file.write_text(json.dumps(queue_data, indent=2))
-        except Exception as e:
-            logger.error(f"Failed to save queue: {e}")
-
-    def _load_queue(self) -> None:
-        try:
-            if self._queue_file.exists():
-                queue_data = json.loads(self._queue_file.read_text())
-                self._queue = [
-                    QueueItem(
-                        url=item['url'],
-                        format_type=item['format_type'],
-                        quality=item['quality'],
-                        playlist=item['playlist'],
-                        playlist_items=item['playlist_items'],
-                        audio_only=item['audio_only'],
-                        status=DownloadStatus(item['status']),
-                        progress=item['progress'],
-                        error=item['error'],
-                        title=item['title'],
-                        id=item['id']
-                    )
-                    for item in queue_data
-                ]
-        except Exception as e:
-            logger.error(f"Failed to load queue: {e}")
-            self._queue = []
\ No newline at end of file
+    def _reindex(self, start: int, end: int) -> None:
+        for position in range(start, end):
+            self._positions[self._queue[position].id] = position
+
+    def _rebuild_index(self) -> None:
+        self._items_by_id.clear()
+        self._positions.clear()
+        for item in self._queue:
+            if not item.id or item.id in self._items_by_id:
+                item.id = uuid.uuid4().hex
+            self._items_by_id[item.id] = item
+        self._reindex(0, len(self._queue))
+
+    def flush(self) -> None:
+        self._save_timer.stop()
+        # A batch that would push the journal past its limit is written
+        # straight into a fresh snapshot instead of appended first
+        if self._store.needs_compaction(self._store.pending_count()):
+            self._store.compact([self._serialize_item(item) for item in self._queue])
+        else:
+            self._store.flush()
+
+    def _save_item(self, item: QueueItem) -> None:
+        self._store.record_put(self._serialize_item(item))
+        self._schedule_save()
+
+    def _schedule_save(self) -> None:
+        if not self._save_timer.isActive():
+            self._save_timer.start()
+
+    @staticmethod
+    def _dedupe_key(item: QueueItem) -> tuple:
+        return (canonical_url(item.url), item.format_type, item.quality,
+                item.playlist, item.playlist_items)
+
+    @staticmethod
+    def _serialize_item(item: QueueItem) -> Dict:
+        return {
+            'url': item.url,
+            'format_type': item.format_type,
+            'quality': item.quality,
+            'playlist': item.playlist,
+            'playlist_items': item.playlist_items,
+            'audio_only': item.audio_only,
+            'status': item.status.value,
+            'progress': item.progress,
+            'error': item.error,
+            'title': item.title,
+            'id': item.id,
+            'filename': item.filename,
+            'rate_limit': item.rate_limit,
+            'duration': item.duration,
+            'filesize': item.filesize,
+            'thumbnail': item.thumbnail
+        }
+
+    @staticmethod
+    def _deserialize_item(data: Dict) -> QueueItem:
+        return QueueItem(
+            url=data['url'],
+            format_type=data['format_type'],
+            quality=data['quality'],
+            playlist=data['playlist'],
+            playlist_items=data['playlist_items'],
+            audio_only=data['audio_only'],
+            status=DownloadStatus(data['status']),
+            progress=data['progress'],
+            error=data['error'],
+            title=data['title'],
+            id=data['id'],
+            filename=data.get('filename', ''),
+            rate_limit=data.get('rate_limit', 0),
+            duration=data.get('duration', 0),
+            filesize=data.get('filesize', 0),
+            thumbnail=data.get('thumbnail', '')
+        )
+
+    def restore_queue(self, download_path: Optional[Path] = None) -> int:
+        if self._restored or self._active:
+            return 0
+        self._restored = True
+
+        restored = [self._deserialize_item(data) for data in self._store.load()]
+        for item in restored:
+            if item.status == DownloadStatus.DOWNLOADING:
+                # Interrupted mid-transfer: queue it again and let yt-dlp
+                # continue from the partial file if one is still on disk
+                item.status = DownloadStatus.PENDING
+                if not self._has_partial_download(item, download_path):
+                    item.progress = 0
+            elif item.status == DownloadStatus.PAUSED and not self._has_partial_download(item, download_path):
+                item.progress = 0
+
+        # Keep anything added before the restore ran after the restored items
+        self._queue = restored + self._queue
+        self._rebuild_index()
+        self._store.compact([self._serialize_item(item) for item in self._queue])
+        self.queue_updated.emit()
+        if restored:
+            self.items_added.emit([item.id for item in restored])
+        return len(restored)
+
+    @staticmethod
+    def _has_partial_download(item: QueueItem, download_path: Optional[Path]) -> bool:
+        candidates = []
+        if item.filename:
+            filename = Path(item.filename)
+            candidates.append(glob.escape(str(filename)) + '*.part*')
+            candidates.append(glob.escape(str(filename)) + '.ytdl')
+        if item.title and download_path:
+            candidates.append(str(Path(glob.escape(str(download_path))) / '**' / (glob.escape(item.title) + '.*.part*')))
+        return any(glob.glob(pattern, recursive=True) for pattern in candidates)
@@ -0,0 +1,189 @@
+from pathlib import Path
+from typing import List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from .downloader import DownloadConfig
+from .engine import DownloadEngine
+from .queue_manager import QueueManager, QueueItem, DownloadStatus
+from .prefetch import MetadataPrefetcher, BACKGROUND
+from .estimator import QueueEstimator
+
+class QueueRunner(QObject):
+    item_started = pyqtSignal(str)
+    item_progress = pyqtSignal(str, dict)
+    item_info = pyqtSignal(str, dict)
+    playlist_progress = pyqtSignal(str, dict)
+    item_finished = pyqtSignal(str, bool, str)
+    item_paused = pyqtSignal(str)
+    item_error = pyqtSignal(str, str)
+    queue_finished = pyqtSignal()
+
+    def __init__(self, queue_manager: QueueManager, engine: DownloadEngine,
+                 download_path: Path, parent: Optional[QObject] = None,
+                 playlist_workers: int = 3, job_timeout: float = 0, prefetch_depth: int = 2,
+                 resolve_metadata: bool = True):
+        super().__init__(parent)
+        self.queue_manager = queue_manager
+        self.engine = engine
+        self.download_path = download_path
+        self.playlist_workers = playlist_workers
+        self.job_timeout = job_timeout
+        # Extraction stage: the next prefetch_depth pending items are resolved
+        # while the current ones download, and with resolve_metadata the rest
+        # of the queue gets its titles and sizes in the background
+        self.prefetch_depth = prefetch_depth
+        self.resolve_metadata = resolve_metadata
+        self.prefetcher = None
+        if prefetch_depth > 0 or resolve_metadata:
+            self.prefetcher = MetadataPrefetcher(engine, parent=self)
+            self.prefetcher.prefetched.connect(self.queue_manager.set_metadata)
+        if resolve_metadata:
+            self.queue_manager.items_added.connect(self._resolve_added)
+        self.estimator = QueueEstimator(queue_manager, parent=self)
+
+        self.engine.progress.connect(self._on_progress)
+        self.engine.info.connect(self.item_info)
+        self.engine.playlist_progress.connect(self._on_playlist_progress)
+        self.engine.completed.connect(self._on_completed)
+        self.engine.paused.connect(self._on_paused)
+        self.engine.error.connect(self.item_error)
+
+    def start(self) -> None:
+        if not self.queue_manager.is_active():
+            self.queue_manager.set_active(True)
+            self.process_queue()
+
+    def pause(self) -> None:
+        # Running downloads stop where they are and become PAUSED items
+        if self.queue_manager.is_active() and not self.queue_manager.is_paused():
+            self.queue_manager.pause_queue()
+            self.engine.pause_all()
+
+    def resume(self) -> None:
+        self.queue_manager.resume_queue()
+        self.queue_manager.resume_paused()
+        if self.queue_manager.is_active():
+            self.process_queue()
+        else:
+            self.start()
+
+    def pause_item(self, item_id: str) -> None:
+        if self.engine.is_running(item_id):
+            # Marked PAUSED once the worker has actually stopped
+            self.engine.pause(item_id)
+        else:
+            self.queue_manager.pause_item(item_id)
+
+    def resume_item(self, item_id: str) -> None:
+        if not self.queue_manager.resume_item(item_id):
+            return
+        # Waits as PENDING until the whole queue is resumed
+        if self.queue_manager.is_paused():
+            return
+        if self.queue_manager.is_active():
+            self.process_queue()
+        else:
+            self.start()
+
+    def cancel(self) -> None:
+        if self.queue_manager.is_active():
+            for item in self.queue_manager.get_active_items():
+                self.queue_manager.finish_item(item.id, False, "Cancelled")
+            self.engine.cancel_all()
+            self.queue_manager.set_active(False)
+
+    def shutdown(self) -> None:
+        if self.prefetcher:
+            self.prefetcher.shutdown()
+
+    def set_rate_limit(self, item_id: str, limit: int) -> None:
+        # Applies to a running download straight away, not just the next start
+        self.queue_manager.set_rate_limit(item_id, limit)
+        self.engine.set_rate_limit(item_id, limit)
+
+    def process_queue(self) -> None:
+        if not self.queue_manager.is_active():
+            return
+
+        # Fill every free slot up to max_concurrent, one worker per item
+        while (next_item := self.queue_manager.get_next_item()) is not None:
+            self.engine.start(next_item.id, self.create_config(next_item))
+            self.item_started.emit(next_item.id)
+        self._prefetch_ahead()
+
+        if self.queue_manager.active_count() == 0 and not self._has_pending_items():
+            self.queue_manager.set_active(False)
+            self.queue_finished.emit()
+
+    def _has_pending_items(self) -> bool:
+        # Paused items don't hold the run open; they wait for the next start
+        return bool(self.queue_manager.get_queue_status()[DownloadStatus.PENDING])
+
+    def create_config(self, item: QueueItem) -> DownloadConfig:
+        return DownloadConfig(
+            url=item.url,
+            output_path=self.download_path,
+            format_type=item.format_type,
+            quality=item.quality,
+            audio_only=item.audio_only,
+            playlist=item.playlist,
+            playlist_items=item.playlist_items,
+            playlist_workers=self.playlist_workers,
+            rate_limit=item.rate_limit,
+            timeout=self.job_timeout
+        )
+
+    def _prefetch_ahead(self) -> None:
+        if self.prefetch_depth <= 0:
+            return
+        for item in self.queue_manager.get_pending(self.prefetch_depth):
+            # Playlists are enumerated lazily by the download stage itself
+            if not item.playlist:
+                self.prefetcher.request(item.id, self.create_config(item))
+
+    @pyqtSlot(list)
+    def _resolve_added(self, item_ids: List[str]) -> None:
+        for item_id in item_ids:
+            item = self.queue_manager.get_item(item_id)
+            if (item is not None and item.status == DownloadStatus.PENDING and not item.playlist
+                    and not (item.duration or item.filesize)):
+                self.prefetcher.request(item.id, self.create_config(item), BACKGROUND)
+
+    @pyqtSlot(str, dict)
+    def _on_progress(self, job_id: str, progress: dict):
+        # Playlist items track entries finished rather than per-file percent
+        if progress.get('status') == 'downloading' and not progress.get('playlist_index'):
+            self.queue_manager.update_progress(job_id, progress.get('percent', 0))
+            self.queue_manager.update_filename(job_id, progress.get('filename', ''))
+        self.estimator.record_progress(job_id, progress)
+        self.item_progress.emit(job_id, progress)
+
+    @pyqtSlot(str, dict)
+    def _on_playlist_progress(self, job_id: str, progress: dict):
+        if progress.get('total'):
+            self.queue_manager.update_progress(job_id, progress['current'] / progress['total'] * 100)
+        self.playlist_progress.emit(job_id, progress)
+
+    @pyqtSlot(str, bool, str)
+    def _on_completed(self, job_id: str, success: bool, message: str):
+        if self.prefetcher:
+            self.prefetcher.forget(job_id)
+        self.estimator.forget(job_id)
+        # Cancelling deactivates the queue before the worker reports back
+        if not self.queue_manager.is_active():
+            return
+
+        if self.queue_manager.finish_item(job_id, success, message) is not None:
+            self.item_finished.emit(job_id, success, message)
+        self.process_queue()
+
+    @pyqtSlot(str)
+    def _on_paused(self, job_id: str):
+        if not self.queue_manager.is_active():
+            return
+
+        if self.queue_manager.pause_item(job_id):
+            self.item_paused.emit(job_id)
+        # A single paused item frees its slot for the next one
+        if not self.queue_manager.is_paused():
+            self.process_queue()
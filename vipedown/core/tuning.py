@@ -0,0 +1,117 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import json
+import threading
+import time
+from loguru import logger
+
+from ..utils.files import atomic_write_text
+
+MIN_FRAGMENTS, MAX_FRAGMENTS = 1, 16
+MIN_CHUNK, MAX_CHUNK = 1024 * 1024, 64 * 1024 * 1024
+DEFAULT_FRAGMENTS = 5
+DEFAULT_CHUNK = 10 * 1024 * 1024
+
+def host_of(url: str) -> str:
+    host = (urlsplit(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+class HostTuner:
+    # Per-host settings for concurrent_fragment_downloads and http_chunk_size,
+    # tuned by hill climbing on measured throughput: after a probe upwards
+    # the next download either confirms it (keep climbing) or is slower
+    # (step back). HTTP 429/403 halves the setting and pauses probing for
+    # a while. Fragmented (HLS/DASH) downloads tune the fragment count,
+    # plain HTTP downloads tune the chunk size.
+
+    def __init__(self, state_file: Optional[Path] = None, min_sample_bytes: int = 2 * 1024 * 1024,
+                 backoff_seconds: float = 900.0, smoothing: float = 0.3):
+        self._state_file = state_file or Path.home() / ".cache" / "vipedown" / "tuning.json"
+        self._min_sample_bytes = min_sample_bytes
+        self._backoff_seconds = backoff_seconds
+        self._smoothing = smoothing
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = self._load()
+
+    def options_for(self, url: str) -> Dict[str, Any]:
+        with self._lock:
+            state = self._hosts.get(host_of(url))
+        if state is None:
+            return {'concurrent_fragment_downloads': DEFAULT_FRAGMENTS, 'http_chunk_size': DEFAULT_CHUNK}
+        return {'concurrent_fragment_downloads': state['fragments'], 'http_chunk_size': state['chunk_size']}
+
+    def record_sample(self, url: str, size: float, elapsed: float, fragmented: bool) -> None:
+        if size < self._min_sample_bytes or elapsed <= 0:
+            return
+        speed = size / elapsed
+        knob = 'fragments' if fragmented else 'chunk_size'
+        with self._lock:
+            state = self._state(host_of(url))
+            baseline = state['speed'][knob]
+            previous = state['previous'].get(knob)
+
+            if previous is not None and baseline and speed < baseline * 0.9:
+                # The last probe made things worse; go back and hold there
+                state[knob] = previous
+                state['previous'].pop(knob)
+            elif time.time() >= state['backoff_until'] and (not baseline or speed >= baseline * 0.95):
+                probed = self._step_up(knob, state[knob])
+                if probed != state[knob]:
+                    state['previous'][knob] = state[knob]
+                    state[knob] = probed
+            else:
+                state['previous'].pop(knob, None)
+
+            state['speed'][knob] = speed if not baseline else (
+                self._smoothing * speed + (1 - self._smoothing) * baseline
+            )
+            self._save()
+
+    def record_throttled(self, url: str, status: int) -> None:
+        with self._lock:
+            state = self._state(host_of(url))
+            now = time.time()
+            # Retries of one request report the same error; back off once per burst
+            if now - state.get('throttled_at', 0.0) < 30:
+                return
+            state['throttled_at'] = now
+            state['fragments'] = max(MIN_FRAGMENTS, state['fragments'] // 2)
+            state['chunk_size'] = max(MIN_CHUNK, state['chunk_size'] // 2)
+            state['previous'] = {}
+            state['backoff_until'] = now + self._backoff_seconds
+            logger.info(
+                f"HTTP {status} from {host_of(url)}: backing off to {state['fragments']} fragments, "
+                f"{state['chunk_size'] // (1024 * 1024)} MiB chunks"
+            )
+            self._save()
+
+    @staticmethod
+    def _step_up(knob: str, value: int) -> int:
+        if knob == 'fragments':
+            return min(MAX_FRAGMENTS, value + 1)
+        return min(MAX_CHUNK, int(value * 1.5))
+
+    def _state(self, host: str) -> Dict[str, Any]:
+        return self._hosts.setdefault(host, {
+            'fragments': DEFAULT_FRAGMENTS,
+            'chunk_size': DEFAULT_CHUNK,
+            'speed': {'fragments': 0.0, 'chunk_size': 0.0},
+            'previous': {},
+            'backoff_until': 0.0
+        })
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if self._state_file.exists():
+                return json.loads(self._state_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load tuning state: {e}")
+        return {}
+
+    def _save(self) -> None:
+        try:
+            self._state_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self._state_file, json.dumps(self._hosts))
+        except OSError as e:
+            logger.error(f"Failed to save tuning state: {e}")
@@ -3,14 +3,16 @@ import os
 import signal
 import multiprocessing
 from pathlib import Path
-from PyQt6.QtWidgets import QApplication
 from loguru import logger
 import atexit
 
-from .ui.main_window import MainWindow
 from .core.config import ConfigManager
 
 def run_app():
+    # Imported here so the headless entry point never loads QtWidgets
+    from PyQt6.QtWidgets import QApplication
+    from .ui.main_window import MainWindow
+
     app = None
     window = None
     
@@ -60,13 +62,23 @@ def run_app():
         except:
             pass
 
+def start_app_process(target=run_app, args=()) -> multiprocessing.Process:
+    # Not daemonic: the GUI may start worker processes of its own (the
+    # "processes" engine backend). cleanup_process() in main() still takes
+    # it down when the launcher exits.
+    app_process = multiprocessing.Process(target=target, args=args)
+    app_process.start()
+    return app_process
+
 def main():
+    if '--headless' in sys.argv[1:]:
+        from .cli import main as cli_main
+        return cli_main([arg for arg in sys.argv[1:] if arg != '--headless'])
+
     multiprocessing.freeze_support()
     multiprocessing.set_start_method('spawn', force=True)
     
-    app_process = multiprocessing.Process(target=run_app)
-    app_process.daemon = True
-    app_process.start()
+    app_process = start_app_process()
     
     def cleanup_process():
         if app_process.is_alive():
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLineEdit, QComboBox, QLabel,
@@ -7,26 +7,64 @@ from PyQt6.QtWidgets import (
     QMessageBox, QGroupBox, QCheckBox, QSpinBox, QSplitter,
     QApplication
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QIcon, QAction
 import sys
 from loguru import logger
-
-from ..core.downloader import VipeDownloader, DownloadConfig
+from yt_dlp.utils import format_bytes
+
+from ..core.downloader import DownloadConfig
+from ..core.engine import create_engine
+from ..core.cache import MetadataCache
+from ..core.bandwidth import BandwidthGovernor
+from ..core.tuning import HostTuner
+from ..core.archive import DownloadArchive
+from ..core.dedup import Deduplicator
+from ..core.runner import QueueRunner
 from ..core.config import ConfigManager
 from ..core.queue_manager import QueueManager, QueueItem, DownloadStatus
+from ..utils.urls import parse_url_list
 from .queue_widget import QueueWidget
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.downloader = VipeDownloader()
         self.config = ConfigManager()
-        self.queue_manager = QueueManager()
+        self.metadata_cache = MetadataCache(
+            ttl=self.config.config.metadata_cache_ttl,
+            max_size=self.config.config.metadata_cache_size
+        )
+        archive = DownloadArchive() if self.config.config.use_download_archive else None
+        self.engine = create_engine(
+            self.config.config.engine_backend,
+            self,
+            cache=self.metadata_cache,
+            progress_rate=self.config.config.progress_rate,
+            governor=BandwidthGovernor(
+                self.config.config.bandwidth_limit,
+                self.config.config.bandwidth_schedule
+            ),
+            tuner=HostTuner() if self.config.config.adaptive_tuning else None,
+            archive=archive,
+            dedup=Deduplicator(archive) if archive is not None and self.config.config.deduplicate else None
+        )
+        self.queue_manager = QueueManager(self.config.config.max_concurrent, cache=self.metadata_cache)
+        self.runner = QueueRunner(
+            self.queue_manager, self.engine, self.config.config.download_path, self,
+            playlist_workers=self.config.config.playlist_workers,
+            job_timeout=self.config.config.job_timeout,
+            prefetch_depth=self.config.config.prefetch_depth,
+            resolve_metadata=self.config.config.resolve_queue_metadata
+        )
         self._shutdown_requested = False
+        # The download the progress panel shows while several are running
+        self._focused_job: Optional[str] = None
+        self.setAcceptDrops(True)
         self._setup_ui()
         self._setup_connections()
         self._setup_tray()
+        # Restore after the first paint so startup isn't blocked on disk I/O
+        QTimer.singleShot(0, self._restore_queue)
 
     def _setup_ui(self):
         self.setWindowTitle("VipeDown")
@@ -49,7 +87,7 @@ class MainWindow(QMainWindow):
         download_layout.addLayout(self._create_button_layout())
         
         # Queue widget
-        self.queue_widget = QueueWidget(self.queue_manager)
+        self.queue_widget = QueueWidget(self.queue_manager, self.runner.estimator)
         
         splitter.addWidget(download_widget)
         splitter.addWidget(self.queue_widget)
@@ -66,13 +104,16 @@ class MainWindow(QMainWindow):
         layout = QHBoxLayout()
 
         self.url_input = QLineEdit()
-        self.url_input.setPlaceholderText("Enter video or playlist URL")
+        self.url_input.setPlaceholderText("Enter video or playlist URL, or drop a list of URLs")
         
         self.paste_button = QPushButton("Paste")
         self.paste_button.setFixedWidth(70)
+        self.import_button = QPushButton("Import...")
+        self.import_button.setToolTip("Add every URL from a text file to the queue")
 
         layout.addWidget(self.url_input)
         layout.addWidget(self.paste_button)
+        layout.addWidget(self.import_button)
         group.setLayout(layout)
         return group
 
@@ -155,10 +196,21 @@ class MainWindow(QMainWindow):
         # Current file label
         self.file_label = QLabel("")
         self.file_label.setWordWrap(True)
+
+        # Playlist progress, shown once a playlist starts reporting entries
+        self.playlist_label = QLabel("")
+        self.playlist_label.setWordWrap(True)
+        self.playlist_progress = QProgressBar()
+        self.playlist_progress.setMinimum(0)
+        self.playlist_progress.setMaximum(100)
+        self.playlist_label.hide()
+        self.playlist_progress.hide()
         
         layout.addWidget(self.progress_bar)
         layout.addLayout(status_layout)
         layout.addWidget(self.file_label)
+        layout.addWidget(self.playlist_label)
+        layout.addWidget(self.playlist_progress)
         
         group.setLayout(layout)
         return group
@@ -184,22 +236,30 @@ class MainWindow(QMainWindow):
 
     def _setup_connections(self):
         self.paste_button.clicked.connect(self._paste_url)
+        self.import_button.clicked.connect(self._import_file)
+        self.url_input.returnPressed.connect(self._add_to_queue)
         self.format_combo.currentTextChanged.connect(self._update_quality_options)
         self.playlist_check.toggled.connect(self._toggle_playlist_options)
 
         self.queue_widget.start_queue.connect(self._start_queue_download)
         self.queue_widget.pause_queue.connect(self._pause_queue)
+        self.queue_widget.resume_queue.connect(self._resume_queue)
+        self.queue_widget.pause_item.connect(self.runner.pause_item)
+        self.queue_widget.resume_item.connect(self.runner.resume_item)
         self.queue_widget.remove_item.connect(self.queue_manager.remove_item)
         self.queue_widget.clear_queue.connect(self.queue_manager.clear_queue)
+        self.queue_widget.set_rate_limit.connect(self.runner.set_rate_limit)
 
         self.download_button.setText("Add to Queue")
         self.download_button.clicked.connect(self._add_to_queue)
         self.cancel_button.clicked.connect(self._cancel_download)
         
-        self.downloader.progress.connect(self._update_progress)
-        self.downloader.completed.connect(self._download_finished)
-        self.downloader.error.connect(self._show_error)
-        self.downloader.playlist_progress.connect(self._update_playlist_progress)
+        self.runner.item_started.connect(self._on_item_started)
+        self.runner.item_progress.connect(self._update_progress)
+        self.runner.item_finished.connect(self._download_finished)
+        self.runner.item_error.connect(self._show_error)
+        self.runner.playlist_progress.connect(self._update_playlist_progress)
+        self.runner.queue_finished.connect(self._on_queue_finished)
 
     def _add_to_queue(self):
         url = self.url_input.text().strip()
@@ -207,7 +267,11 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Please enter a URL")
             return
 
-        queue_item = QueueItem(
+        if self._import_urls([url]):
+            self.url_input.clear()
+
+    def _create_queue_item(self, url: str) -> QueueItem:
+        return QueueItem(
             url=url,
             format_type=self.format_combo.currentText().lower(),
             quality=self._get_selected_quality(),
@@ -215,44 +279,109 @@ class MainWindow(QMainWindow):
             playlist_items=self.playlist_items.text().strip() if hasattr(self, 'playlist_items') else "",
             audio_only=self.format_combo.currentText().lower() == "audio"
         )
-        
-        self.queue_manager.add_item(queue_item)
-        self.url_input.clear()
-        self.phase_label.setText("Added to queue")
 
-    def _start_queue_download(self):
-        if not self.queue_manager.is_active():
-            self.queue_manager.set_active(True)
-            self._process_next_in_queue()
+    def _import_urls(self, lines: Iterable[str]) -> bool:
+        urls, rejected = parse_url_list(lines)
+        if not urls:
+            QMessageBox.warning(self, "Error", "No valid URLs found")
+            return False
+
+        added = self.queue_manager.add_items([self._create_queue_item(url) for url in urls])
+        message = f"Added {len(added)} item(s) to queue"
+        if len(added) < len(urls):
+            message += f", {len(urls) - len(added)} already queued"
+        if rejected:
+            message += f", {len(rejected)} invalid skipped"
+            logger.warning(f"Skipped {len(rejected)} invalid URL(s) on import")
+        self.phase_label.setText(message)
+        return True
+
+    def _import_file(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import URLs", str(Path.home()), "Text files (*.txt *.list);;All files (*)"
+        )
+        if path:
+            lines = self._read_url_files([Path(path)])
+            if lines:
+                self._import_urls(lines)
+
+    def _read_url_files(self, paths: List[Path]) -> List[str]:
+        lines: List[str] = []
+        for path in paths:
+            try:
+                lines.extend(path.read_text(encoding='utf-8', errors='replace').splitlines())
+            except OSError as e:
+                logger.error(f"Failed to read URL list {path}: {e}")
+                QMessageBox.warning(self, "Error", f"Could not read {path.name}: {e}")
+        return lines
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls() or event.mimeData().hasText():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        mime = event.mimeData()
+        if mime.hasUrls():
+            # Dropped files are URL lists; dropped links are queued as-is
+            files = [Path(url.toLocalFile()) for url in mime.urls() if url.isLocalFile()]
+            links = [url.toString() for url in mime.urls() if not url.isLocalFile()]
+            self._import_urls(self._read_url_files(files) + links)
+        else:
+            self._import_urls(mime.text().splitlines())
+        event.acceptProposedAction()
 
-    def _process_next_in_queue(self):
-        if not self.queue_manager.is_active():
-            return
+    def _restore_queue(self):
+        restored = self.queue_manager.restore_queue(self.config.config.download_path)
+        if restored:
+            self.phase_label.setText(f"Restored {restored} queued item(s)")
 
-        next_item = self.queue_manager.get_next_item()
-        if next_item:
-            config = DownloadConfig(
-                url=next_item.url,
-                output_path=self.config.config.download_path,
-                format_type=next_item.format_type,
-                quality=next_item.quality,
-                audio_only=next_item.audio_only,
-                playlist=next_item.playlist,
-                playlist_items=next_item.playlist_items
-            )
+    def _start_queue_download(self):
+        self.runner.start()
+
+    def _on_item_started(self, item_id: str):
+        if self._follows(item_id):
             self._reset_progress()
             self.phase_label.setText("Starting download...")  # Changed from status_label
-            self.downloader.download(config)
+        self.cancel_button.setEnabled(True)
+
+    def _follows(self, job_id: str) -> bool:
+        # Every row in the queue draws its own progress; the panel follows
+        # the download selected there, or else the one running longest
+        selected = self.queue_widget.selected_item_id()
+        if selected and self._is_downloading(selected):
+            focused = selected
+        elif self._focused_job and self._is_downloading(self._focused_job):
+            focused = self._focused_job
+        else:
+            focused = job_id
+        if focused != self._focused_job:
+            self._focused_job = focused
+            # Shown again if the newly followed download is a playlist
+            self.playlist_progress.hide()
+            self.playlist_label.hide()
+        return job_id == focused
+
+    def _is_downloading(self, item_id: str) -> bool:
+        item = self.queue_manager.get_item(item_id)
+        return item is not None and item.status == DownloadStatus.DOWNLOADING
+
+    def _on_queue_finished(self):
+        self.cancel_button.setEnabled(False)
+        saved = self.engine.dedup.space_saved() if self.engine.dedup else 0
+        if saved:
+            self.phase_label.setText(f"Queue completed - {format_bytes(saved)} saved by deduplication")
         else:
-            self.queue_manager.set_active(False)
             self.phase_label.setText("Queue completed")
 
     def _pause_queue(self):
         if self.queue_manager.is_active():
-            self.queue_manager.pause_queue()
-            self.downloader.cancel()
+            self.runner.pause()
             self.phase_label.setText("Queue paused")
 
+    def _resume_queue(self):
+        self.runner.resume()
+        self.phase_label.setText("Queue resumed")
+
     def _setup_tray(self):
         self.tray_icon = QSystemTrayIcon(self)
         self.tray_icon.setIcon(self.style().standardIcon(self.style().StandardPixmap.SP_ArrowDown))
@@ -286,8 +415,13 @@ class MainWindow(QMainWindow):
         self.create_playlist_folder.setEnabled(enabled)
 
     def _paste_url(self):
-        clipboard = self.clipboard()
-        self.url_input.setText(clipboard.text())
+        clipboard = QApplication.clipboard()
+        text = clipboard.text().strip()
+        # A pasted list goes straight into the queue; a single URL can still be edited
+        if len(text.split()) > 1:
+            self._import_urls(text.splitlines())
+        else:
+            self.url_input.setText(text)
 
     def _start_download(self):
         url = self.url_input.text().strip()
@@ -299,10 +433,10 @@ class MainWindow(QMainWindow):
         
         try:
             config = self._create_download_config(url)
-            self.downloader.download(config)
+            self.engine.start(url, config)
         except Exception as e:
             logger.exception("Failed to start download")
-            self._show_error(str(e))
+            self._show_error(url, str(e))
             self._reset_download_ui()
 
     def _create_download_config(self, url: str) -> DownloadConfig:
@@ -346,7 +480,9 @@ class MainWindow(QMainWindow):
             return quality_text.split("(")[1].split(")")[0]
         return "best"
 
-    def _update_progress(self, progress: dict):
+    def _update_progress(self, job_id: str, progress: dict):
+        if not self._follows(job_id):
+            return
         try:
             if progress["status"] == "downloading":
                 # Update progress bar
@@ -387,6 +523,9 @@ class MainWindow(QMainWindow):
                 fragment_info = progress.get("fragment_info", "")
                 if fragment_info:
                     phase = f"{phase} - {fragment_info}"
+                running = self.queue_manager.active_count()
+                if running > 1:
+                    phase += f" ({running} downloads running)"
                 self.phase_label.setText(phase)
                 
                 filename = Path(progress.get('filename', '')).name
@@ -403,7 +542,9 @@ class MainWindow(QMainWindow):
         except Exception as e:
             logger.error(f"Error updating progress: {e}")
 
-    def _update_playlist_progress(self, progress: dict):
+    def _update_playlist_progress(self, job_id: str, progress: dict):
+        if not self._follows(job_id):
+            return
         current = progress.get('current', 0)
         total = progress.get('total', 0)
         title = progress.get('title', '')
@@ -411,13 +552,26 @@ class MainWindow(QMainWindow):
         if total > 0:
             percent = (current / total) * 100
             self.playlist_progress.setValue(int(percent))
-            self.playlist_label.setText(f"Playlist Progress: {current}/{total} - Current: {title}")
+            # The total keeps growing while a lazy playlist is still being listed
+            text = f"Playlist Progress: {current}/{total}{'+' if progress.get('enumerating') else ''}"
+            if progress.get('active'):
+                text += f" ({progress['active']} active)"
+            if progress.get('failed'):
+                text += f" - {progress['failed']} failed"
+            if progress.get('skipped'):
+                text += f" - {progress['skipped']} already downloaded"
+            if title:
+                text += f" - Current: {title}"
+            self.playlist_label.setText(text)
+            self.playlist_label.show()
+            self.playlist_progress.show()
+
+    def _download_finished(self, job_id: str, success: bool, message: str):
+        current_item = self.queue_manager.get_item(job_id)
+        if current_item is None:
+            return
 
-    def _download_finished(self, success: bool, message: str):
-        current_item = self.queue_manager.get_queue()[self.queue_manager._current_index]
-        
         if success:
-            self.queue_manager.update_status(current_item.url, DownloadStatus.COMPLETED)
             if self.config.config.notify_on_complete:
                 self.tray_icon.showMessage(
                     "Download Complete",
@@ -425,7 +579,6 @@ class MainWindow(QMainWindow):
                     self.tray_icon.MessageIcon.Information
                 )
         else:
-            self.queue_manager.update_status(current_item.url, DownloadStatus.FAILED, message)
             self.phase_label.setText(f"Download failed: {message}")  # Changed from status_label
             self.tray_icon.showMessage(
                 "Download Failed",
@@ -433,8 +586,6 @@ class MainWindow(QMainWindow):
                 self.tray_icon.MessageIcon.Critical
             )
 
-        self._process_next_in_queue()
-
     def _reset_progress(self):
         self.progress_bar.setValue(0)
         self.progress_bar.setFormat("%p% - 0 MB / 0 MB")
@@ -443,15 +594,13 @@ class MainWindow(QMainWindow):
         self.eta_label.setText("")
         self.file_label.setText("")
 
-    def _show_error(self, error: str):
+    def _show_error(self, job_id: str, error: str):
         QMessageBox.critical(self, "Error", error)
 
     def _cancel_download(self):
         if self.queue_manager.is_active():
-            current_item = self.queue_manager.get_queue()[self.queue_manager._current_index]
-            self.queue_manager.update_status(current_item.url, DownloadStatus.FAILED, "Cancelled")
-            self.downloader.cancel()
-            self.queue_manager.set_active(False)
+            self.runner.cancel()
+            self.cancel_button.setEnabled(False)
             self.phase_label.setText("Download cancelled")
             self._reset_progress()
 
@@ -461,12 +610,14 @@ class MainWindow(QMainWindow):
             
             self.hide()
             
-            if hasattr(self, 'downloader') and self.downloader is not None:
-                self.downloader.cancel()
+            if hasattr(self, 'engine') and self.engine is not None:
+                self.runner.shutdown()
+                self.engine.shutdown()
+            self.metadata_cache.flush()
             
-            # Clear the queue
+            # Persist the queue so it is restored on next start
             if hasattr(self, 'queue_manager') and self.queue_manager is not None:
-                self.queue_manager.clear_queue()
+                self.queue_manager.flush()
 
             if hasattr(self, 'config') and self.config is not None:
                 self.config.save()
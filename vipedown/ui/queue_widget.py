@@ -1,64 +1,148 @@
+from typing import Optional
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QListWidget, QListWidgetItem, QLabel, QProgressBar,
-    QMenu, QMessageBox
+    QListView, QLabel, QStyledItemDelegate, QStyleOptionViewItem,
+    QStyleOptionProgressBar, QStyle, QApplication, QMenu, QMessageBox, QInputDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex, QRect, QSize
+from PyQt6.QtGui import QColor, QPainter
+from yt_dlp.utils import format_bytes, formatSeconds
 
 from ..core.queue_manager import QueueManager, QueueItem, DownloadStatus
+from ..core.bandwidth import parse_rate, format_rate
+from ..core.estimator import QueueEstimator
 
-class QueueListItem(QWidget):
-    def __init__(self, item: QueueItem):
-        super().__init__()
-        self.item = item
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
+class QueueModel(QAbstractListModel):
+    ItemRole = Qt.ItemDataRole.UserRole + 1
 
-        title_layout = QHBoxLayout()
-        self.title_label = QLabel(item.title or item.url)
-        self.status_label = QLabel(item.status.value)
-        title_layout.addWidget(self.title_label)
-        title_layout.addStretch()
-        title_layout.addWidget(self.status_label)
+    def __init__(self, queue_manager: QueueManager, parent=None):
+        super().__init__(parent)
+        self.queue_manager = queue_manager
+        self._items = queue_manager.get_queue()
+        self.queue_manager.queue_updated.connect(self._reset)
+        self.queue_manager.item_changed.connect(self._item_changed)
 
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setValue(int(item.progress))
-        
-        info_layout = QHBoxLayout()
-        format_label = QLabel(f"Format: {item.format_type}")
-        quality_label = QLabel(f"Quality: {item.quality}")
-        info_layout.addWidget(format_label)
-        info_layout.addWidget(quality_label)
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.title or item.url
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return item.url
+        if role == self.ItemRole:
+            return item
+        return None
+
+    def _reset(self):
+        self.beginResetModel()
+        self._items = self.queue_manager.get_queue()
+        self.endResetModel()
+
+    def _item_changed(self, row: int):
+        if 0 <= row < len(self._items):
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+class QueueItemDelegate(QStyledItemDelegate):
+    MARGIN = 5
+    SPACING = 4
+    BAR_HEIGHT = 16
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        item: QueueItem = index.data(QueueModel.ItemRole)
+        if item is None:
+            return
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        painter.save()
+        line_height = option.fontMetrics.height()
+        rect = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        y = rect.top()
+
+        # Title and status
+        status_text = item.status.value
+        status_width = option.fontMetrics.horizontalAdvance(status_text)
+        title_rect = QRect(rect.left(), y, rect.width() - status_width - self.SPACING, line_height)
+        title = option.fontMetrics.elidedText(
+            item.title or item.url, Qt.TextElideMode.ElideRight, title_rect.width()
+        )
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+        painter.drawText(
+            QRect(rect.right() - status_width, y, status_width, line_height),
+            Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+            status_text
+        )
+        y += line_height + self.SPACING
+
+        # Progress bar
+        bar = QStyleOptionProgressBar()
+        bar.rect = QRect(rect.left(), y, rect.width(), self.BAR_HEIGHT)
+        bar.state = option.state | QStyle.StateFlag.State_Horizontal
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = int(item.progress)
+        bar.text = f"{bar.progress}%"
+        bar.textVisible = True
+        bar.textAlignment = Qt.AlignmentFlag.AlignCenter
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, bar, painter, option.widget)
+        y += self.BAR_HEIGHT + self.SPACING
+
+        # Format info
+        info_text = f"Format: {item.format_type}    Quality: {item.quality}"
         if item.playlist:
-            playlist_label = QLabel("Playlist")
-            info_layout.addWidget(playlist_label)
-        info_layout.addStretch()
+            info_text += "    Playlist"
+        if item.duration:
+            info_text += f"    Duration: {formatSeconds(item.duration)}"
+        if item.filesize:
+            info_text += f"    Size: {format_bytes(item.filesize)}"
+        if item.rate_limit:
+            info_text += f"    Limit: {format_rate(item.rate_limit)}"
+        painter.drawText(
+            QRect(rect.left(), y, rect.width(), line_height),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            info_text
+        )
+        y += line_height + self.SPACING
 
-        layout.addLayout(title_layout)
-        layout.addWidget(self.progress_bar)
-        layout.addLayout(info_layout)
-        
         if item.error:
-            error_label = QLabel(f"Error: {item.error}")
-            error_label.setStyleSheet("color: red;")
-            layout.addWidget(error_label)
+            painter.setPen(QColor("red"))
+            error = option.fontMetrics.elidedText(
+                f"Error: {item.error}", Qt.TextElideMode.ElideRight, rect.width()
+            )
+            painter.drawText(
+                QRect(rect.left(), y, rect.width(), line_height),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                error
+            )
+        painter.restore()
 
-    def update_progress(self, progress: float):
-        self.progress_bar.setValue(int(progress))
-
-    def update_status(self, status: DownloadStatus):
-        self.status_label.setText(status.value)
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        item: QueueItem = index.data(QueueModel.ItemRole)
+        line_height = option.fontMetrics.height()
+        lines = 3 if item is not None and item.error else 2
+        height = 2 * self.MARGIN + lines * (line_height + self.SPACING) + self.BAR_HEIGHT
+        return QSize(option.rect.width(), height)
 
 class QueueWidget(QWidget):
     start_queue = pyqtSignal()
     pause_queue = pyqtSignal()
+    resume_queue = pyqtSignal()
+    pause_item = pyqtSignal(str)
+    resume_item = pyqtSignal(str)
     remove_item = pyqtSignal(int)
     clear_queue = pyqtSignal()
+    set_rate_limit = pyqtSignal(str, int)
 
-    def __init__(self, queue_manager: QueueManager):
+    def __init__(self, queue_manager: QueueManager, estimator: Optional[QueueEstimator] = None):
         super().__init__()
         self.queue_manager = queue_manager
+        self.estimator = estimator
         self._setup_ui()
         self._connect_signals()
 
@@ -77,13 +161,15 @@ class QueueWidget(QWidget):
         button_layout.addStretch()
         
         # Queue list
-        self.queue_list = QListWidget()
+        self.queue_model = QueueModel(self.queue_manager, self)
+        self.queue_list = QListView()
+        self.queue_list.setModel(self.queue_model)
+        self.queue_list.setItemDelegate(QueueItemDelegate(self.queue_list))
         self.queue_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.queue_list.customContextMenuRequested.connect(self._show_context_menu)
 
         # Status bar
         self.status_bar = QLabel()
-        self._update_status_bar()
 
         layout.addLayout(button_layout)
         layout.addWidget(self.queue_list)
@@ -93,41 +179,56 @@ class QueueWidget(QWidget):
 
     def _connect_signals(self):
         self.start_button.clicked.connect(self.start_queue.emit)
-        self.pause_button.clicked.connect(self.pause_queue.emit)
+        self.pause_button.clicked.connect(self._toggle_pause)
         self.clear_button.clicked.connect(self._confirm_clear)
         
         self.queue_manager.queue_updated.connect(self._refresh_queue)
         self.queue_manager.status_changed.connect(self._update_item_status)
+        if self.estimator:
+            self.estimator.updated.connect(self._update_status_bar)
 
     def _refresh_queue(self):
-        self.queue_list.clear()
-        for item in self.queue_manager.get_queue():
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(QWidget().sizeHint())  # Will be updated when widget is set
-            self.queue_list.addItem(list_item)
-            
-            item_widget = QueueListItem(item)
-            self.queue_list.setItemWidget(list_item, item_widget)
-
+        # Rows are repainted by the model; only the summary needs refreshing
         self._update_status_bar()
         self._update_buttons()
 
+    def selected_item_id(self) -> Optional[str]:
+        item: Optional[QueueItem] = self.queue_list.currentIndex().data(QueueModel.ItemRole)
+        return item.id if item else None
+
     def _update_status_bar(self):
         status = self.queue_manager.get_queue_status()
         status_text = f"Total: {len(self.queue_manager.get_queue())} | "
         status_text += f"Pending: {status[DownloadStatus.PENDING]} | "
         status_text += f"Downloading: {status[DownloadStatus.DOWNLOADING]} | "
+        status_text += f"Paused: {status[DownloadStatus.PAUSED]} | "
         status_text += f"Completed: {status[DownloadStatus.COMPLETED]} | "
         status_text += f"Failed: {status[DownloadStatus.FAILED]}"
+        if self.estimator:
+            status_text += self._estimate_text()
         self.status_bar.setText(status_text)
 
+    def _estimate_text(self) -> str:
+        remaining, unknown = self.estimator.bytes_remaining()
+        if not remaining and not unknown:
+            return ""
+        text = f" | Remaining: {format_bytes(remaining)}"
+        if unknown:
+            text += f" (+{unknown} of unknown size)"
+        eta = self.estimator.eta()
+        if eta is not None and remaining:
+            eta_text = formatSeconds(eta) if eta >= 60 else f"{int(eta)}s"
+            text += f" | Queue ETA: {eta_text} at {format_rate(int(self.estimator.throughput()))}"
+        return text
+
     def _update_buttons(self):
         queue_active = self.queue_manager.is_active()
         queue_paused = self.queue_manager.is_paused()
         has_items = bool(self.queue_manager.get_queue())
 
         self.start_button.setEnabled(has_items and not queue_active)
-        self.pause_button.setEnabled(queue_active and not queue_paused)
+        self.pause_button.setText("Resume" if queue_paused else "Pause")
+        self.pause_button.setEnabled(queue_active)
         self.clear_button.setEnabled(has_items and not queue_active)
 
     def _show_context_menu(self, position):
@@ -135,18 +236,52 @@ class QueueWidget(QWidget):
         remove_action = menu.addAction("Remove")
         move_up_action = menu.addAction("Move Up")
         move_down_action = menu.addAction("Move Down")
+        limit_action = menu.addAction("Set Speed Limit...")
 
-        item = self.queue_list.itemAt(position)
-        if item:
-            index = self.queue_list.row(item)
+        index_at = self.queue_list.indexAt(position)
+        if index_at.isValid():
+            index = index_at.row()
+            item: QueueItem = index_at.data(QueueModel.ItemRole)
+            pause_action = resume_action = None
+            if item.status == DownloadStatus.PAUSED:
+                resume_action = menu.addAction("Resume")
+            elif item.status in (DownloadStatus.PENDING, DownloadStatus.DOWNLOADING):
+                pause_action = menu.addAction("Pause")
             action = menu.exec(self.queue_list.mapToGlobal(position))
             
             if action == remove_action:
                 self.remove_item.emit(index)
             elif action == move_up_action and index > 0:
                 self.queue_manager.move_item(index, index - 1)
-            elif action == move_down_action and index < self.queue_list.count() - 1:
+            elif action == move_down_action and index < self.queue_model.rowCount() - 1:
                 self.queue_manager.move_item(index, index + 1)
+            elif action == limit_action:
+                self._ask_rate_limit(item)
+            elif action is not None and action == pause_action:
+                self.pause_item.emit(item.id)
+            elif action is not None and action == resume_action:
+                self.resume_item.emit(item.id)
+
+    def _ask_rate_limit(self, item: QueueItem):
+        current = format_rate(item.rate_limit) if item.rate_limit else ""
+        text, ok = QInputDialog.getText(
+            self, "Speed Limit",
+            "Maximum speed for this download (e.g. 500K, 2M; empty for unlimited):",
+            text=current.removesuffix("/s")
+        )
+        if not ok:
+            return
+        limit = parse_rate(text)
+        if limit is None:
+            QMessageBox.warning(self, "Error", f"Invalid speed limit: {text}")
+            return
+        self.set_rate_limit.emit(item.id, limit)
+
+    def _toggle_pause(self):
+        if self.queue_manager.is_paused():
+            self.resume_queue.emit()
+        else:
+            self.pause_queue.emit()
 
     def _confirm_clear(self):
         reply = QMessageBox.question(
@@ -159,20 +294,6 @@ class QueueWidget(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             self.clear_queue.emit()
 
-    def update_item_progress(self, url: str, progress: float):
-        for i in range(self.queue_list.count()):
-            item = self.queue_list.item(i)
-            widget = self.queue_list.itemWidget(item)
-            if widget.item.url == url:
-                widget.update_progress(progress)
-                break
-
-    def _update_item_status(self, url: str, status: DownloadStatus):
-        for i in range(self.queue_list.count()):
-            item = self.queue_list.item(i)
-            widget = self.queue_list.itemWidget(item)
-            if widget.item.url == url:
-                widget.update_status(status)
-                break
+    def _update_item_status(self, item_id: str, status: DownloadStatus):
         self._update_status_bar()
-        self._update_buttons()
\ No newline at end of file
+        self._update_buttons()
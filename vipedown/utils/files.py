@@ -0,0 +1,12 @@
+from pathlib import Path
+import os
+
+def atomic_write_text(path: Path, data: str) -> None:
+    # Write to a sibling temp file and rename over the target, so readers
+    # (and crashes) only ever see the old or the new complete file
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,41 @@
+from typing import Iterable, List, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import re
+
+def canonical_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((
+        (parts.scheme or 'https').lower(),
+        parts.netloc.lower(),
+        parts.path,
+        query,
+        ''
+    ))
+
+def is_valid_url(url: str) -> bool:
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    return parts.scheme.lower() in ('http', 'https') and bool(parts.hostname)
+
+def parse_url_list(lines: Iterable[str]) -> Tuple[List[str], List[str]]:
+    # Accepts pasted text, files and drops alike: one or more URLs per line,
+    # '#' comments and blank lines ignored. Returns (unique valid, rejected).
+    urls: List[str] = []
+    rejected: List[str] = []
+    seen = set()
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        for token in re.split(r'\s+', line):
+            if not is_valid_url(token):
+                rejected.append(token)
+                continue
+            key = canonical_url(token)
+            if key not in seen:
+                seen.add(key)
+                urls.append(token)
+    return urls, rejected